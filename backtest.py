@@ -0,0 +1,400 @@
+"""
+backtest.py — Moteur de backtest momentum vectorisé.
+
+Même stratégie et mêmes résultats que l'ancienne boucle de momentum.py
+(une itération pandas par date de rebalancement), mais chaque étape est une
+opération sur la matrice entière :
+- éligibilité : historique mensuel complet sur lookback + 1 mois (sommes
+  cumulées des valeurs présentes) ;
+- sélection : les n meilleurs signaux par ligne (np.argpartition), égalités
+  départagées dans l'ordre des colonnes comme Series.nlargest ;
+- poids, turnover et coûts : une matrice (rebalancements × tickers) ;
+- rendements : valeur du portefeuille buy & hold de chaque période, calculée
+  pour tous les jours d'un coup à partir des prix complétés (ffill).
+
+Le signal masqué par l'éligibilité ne dépend que des prix et de (lookback,
+skip), les prix complétés que des prix : ils sont publiés dans le cache
+partagé, indexés par l'empreinte des prix. Changer n_stocks, la pondération
+ou les coûts ne refait que la sélection et le calcul des rendements.
+
+run_backtest_incremental enregistre en plus l'état au dernier rebalancement
+terminé (rendements, poids, turnover) dans BACKTEST_DIR : quand la date de
+fin avance, seules les nouvelles périodes sont simulées, sur une fenêtre de
+prix limitée à lookback mois avant la reprise.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import price_store
+import shared_cache
+from bars import resample_close
+from price_matrix import PriceMatrix
+
+BACKTEST_DIR = os.environ.get("INDEX_SUIVI_BACKTESTS", os.path.join("data", "backtests"))
+
+
+def _eligible(monthly, lookback):
+    """Masque (mois × tickers) : aucune clôture manquante sur les lookback + 1 derniers mois."""
+    present = np.cumsum(~np.isnan(monthly), axis=0)
+    window = present.copy()
+    window[lookback + 1:] -= present[:-(lookback + 1)]
+    return window == lookback + 1
+
+
+def _momentum(monthly, lookback, skip):
+    """Performance de t-lookback à t-skip (mois × tickers)."""
+    def shifted(k):
+        out = np.full_like(monthly, np.nan)
+        out[k:] = monthly[:len(monthly) - k]
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return shifted(skip) / shifted(lookback) - 1
+
+
+def _top(signal, n):
+    """Masque des n plus grands signaux par ligne (NaN exclus).
+
+    Les ex æquo au seuil sont départagés par ordre de colonne, comme
+    Series.nlargest(keep="first").
+    """
+    values = np.where(np.isnan(signal), -np.inf, signal)
+    kth = values.shape[1] - n
+    cut = np.argpartition(values, kth, axis=1)[:, kth]
+    threshold = values[np.arange(len(values)), cut][:, None]
+    above = values > threshold
+    tied = values == threshold
+    missing = n - above.sum(axis=1, keepdims=True)
+    return above | (tied & (np.cumsum(tied, axis=1) <= missing))
+
+
+def _last_valid(values):
+    """Ligne de la dernière valeur présente à chaque date (-1 si aucune), en int32."""
+    rows = np.where(np.isnan(values), np.int32(-1), np.arange(len(values), dtype="int32")[:, None])
+    return np.maximum.accumulate(rows, axis=0)
+
+
+def _next_valid(values):
+    """Ligne de la prochaine valeur présente à chaque date (len si aucune), en int32."""
+    n = len(values)
+    rows = np.where(np.isnan(values), np.int32(n), np.arange(n, dtype="int32")[:, None])
+    return np.minimum.accumulate(rows[::-1], axis=0)[::-1]
+
+
+def signals(prices, lookback, skip, key=None):
+    """Signal momentum (fin de mois × tickers), NaN si l'historique est incomplet.
+
+    `key` : empreinte de `prices` (shared_cache.fingerprint), si déjà calculée.
+    """
+    key = key or shared_cache.fingerprint(prices)
+
+    def compute():
+        monthly = resample_close(prices, "ME")
+        values = monthly.to_numpy(dtype="float64")
+        signal = _momentum(values, lookback, skip)
+        signal[~_eligible(values, lookback)] = np.nan
+        return pd.DataFrame(signal, index=monthly.index, columns=monthly.columns)
+
+    return shared_cache.get_or_compute(("momentum", key, lookback, skip), compute)
+
+
+def _daily(prices, key):
+    """Prix complétés (ffill, 0 avant la première cotation) et ligne de la
+    prochaine cotation de chaque titre, depuis le cache partagé.
+
+    Les deux matrices gardent le type des prix (float32 possible : les numéros
+    de ligne y sont exacts jusqu'à 2**24) ; aucune copie float64 des prix.
+    """
+    values = prices.to_numpy()
+
+    def filled():
+        out = values[np.maximum(_last_valid(values), 0), np.arange(values.shape[1])]
+        return pd.DataFrame(np.nan_to_num(out, copy=False), index=prices.index,
+                            columns=prices.columns)
+
+    def following():
+        return pd.DataFrame(_next_valid(values).astype(values.dtype),
+                            index=prices.index, columns=prices.columns)
+
+    return (shared_cache.get_or_compute(("ffill", key), filled).to_numpy(),
+            shared_cache.get_or_compute(("next_valid", key), following).to_numpy())
+
+
+def _simulate(prices, key, momentum, rebal_dates, n_stocks, weighting, cost_bps,
+              previous=None, universe=None):
+    """Simule les périodes commençant aux dates `rebal_dates` (la dernière court
+    jusqu'à la fin de `prices`).
+
+    `previous` : poids détenus avant la première date (Series), pour le turnover.
+    `universe` : composition historique (constituents.Membership) ; seuls les
+    membres de l'indice à chaque date de rebalancement sont éligibles.
+    Retourne (rendements quotidiens, poids par date, turnover par date).
+    """
+    tickers = momentum.columns
+    empty = pd.Series(dtype="float64", index=pd.DatetimeIndex([], name=prices.index.name))
+
+    # --- Sélection des titres à chaque date de rebalancement ---
+    signal = momentum.to_numpy()[momentum.index.get_indexer(rebal_dates)]
+    if universe is not None:
+        signal[~universe.mask(rebal_dates, tickers)] = np.nan
+    kept = (~np.isnan(signal)).sum(axis=1) >= n_stocks
+    signal = signal[kept]
+    if not len(signal):
+        return empty, {}, empty
+    selected = _top(signal, n_stocks)
+
+    # --- Pondération ---
+    if weighting == "Égale":
+        weights = np.where(selected, 1 / n_stocks, 0.0)
+    else:
+        floor = np.where(selected, signal, np.inf).min(axis=1, keepdims=True)
+        pos = np.where(selected, signal - floor + 1e-6, 0.0)
+        weights = pos / pos.sum(axis=1, keepdims=True)
+
+    # --- Turnover et coûts ---
+    held = np.zeros((1, len(tickers)))
+    if previous is not None:
+        held[0] = previous.reindex(tickers, fill_value=0.0).to_numpy()
+    turnover = np.abs(weights - np.vstack([held, weights[:-1]])).sum(axis=1) / 2
+    cost = turnover * 2 * cost_bps / 10000  # achat + vente
+
+    # Poids par date, du meilleur signal au moins bon (ordre de nlargest)
+    names = np.asarray(tickers, dtype=object)
+    order = np.argsort(np.where(selected, -signal, np.inf), axis=1, kind="stable")[:, :n_stocks]
+    weights_history = {
+        date: pd.Series(weights[i, order[i]], index=names[order[i]])
+        for i, date in enumerate(rebal_dates[kept])
+    }
+    turnover_history = pd.Series(turnover, index=rebal_dates[kept])
+
+    # --- Périodes de détention : lignes quotidiennes [début, fin] ---
+    filled, following = _daily(prices, key)
+    days = prices.index
+    next_dates = rebal_dates[1:].append(days[-1:])[kept]
+    first = days.searchsorted(rebal_dates[kept], side="left")
+    last = days.searchsorted(next_dates, side="right") - 1
+
+    # Première ligne où tous les titres retenus ont un prix dans la période
+    # (les lignes précédentes sont écartées, comme le dropna de l'ancienne boucle)
+    entry = following[np.minimum(first, len(days) - 1)].astype("int64")
+    starts = np.where(selected, entry, -1).max(axis=1)
+    starts = np.where(first < len(days), starts, len(days))
+    usable = last - starts >= 1
+    if not usable.any():
+        return empty, weights_history, turnover_history
+    starts, last = starts[usable], last[usable]
+    weights, cost = weights[usable], cost[usable]
+
+    # Prix complétés : à partir de `starts`, le ffill global coïncide avec
+    # celui limité à la période pour tous les titres retenus.
+    # Parts détenues (poids / prix d'entrée) : valeur = prix · parts, sur les
+    # seules colonnes détenues (n_stocks par période, pas tout l'univers)
+    columns = order[usable]
+    entry_prices = np.take_along_axis(filled[starts], columns, axis=1).astype("float64")
+    shares = np.take_along_axis(weights, columns, axis=1) / entry_prices
+
+    lengths = last - starts
+    segment = np.repeat(np.arange(len(starts)), lengths)
+    offset = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    rows = starts[segment] + 1 + offset
+    value = np.einsum("ij,ij->i", filled[rows[:, None], columns[segment]], shares[segment])
+
+    # Rendement quotidien ; le premier jour de chaque période part de 1 et paie les coûts
+    opening = offset == 0
+    before = np.where(opening, 1.0, np.roll(value, 1))
+    rets = value / before - 1
+    rets[opening] -= cost
+
+    strat_rets = pd.Series(rets, index=days[rows])
+    strat_rets = strat_rets[~strat_rets.index.duplicated(keep="first")]
+    return strat_rets, weights_history, turnover_history
+
+
+def rebalance_dates(index, lookback, rebal_freq):
+    """Dates de rebalancement (fins de mois) d'un calendrier de prix quotidien."""
+    months = pd.date_range(index[0], index[-1] + pd.offsets.MonthEnd(0), freq="ME")
+    step = 1 if rebal_freq == "Mensuel" else 3
+    return months[lookback::step]
+
+
+def run_backtest(prices, lookback, skip, n_stocks, rebal_freq,
+                 weighting, cost_bps, universe=None):
+    """Backtest momentum avec rebalancement périodique.
+
+    `prices` : DataFrame ou PriceMatrix (dates × tickers), prix ajustés.
+    `universe` : composition historique de l'indice (constituents.Membership),
+    None pour considérer tous les tickers de `prices` à toutes les dates.
+    Retourne (rendements quotidiens, poids par date de rebalancement,
+    turnover moyen), ou (None, None, None) si aucune période n'est exploitable.
+    """
+    if isinstance(prices, PriceMatrix):
+        prices = prices.to_frame()
+    key = shared_cache.fingerprint(prices)
+    momentum = signals(prices, lookback, skip, key)
+    step = 1 if rebal_freq == "Mensuel" else 3
+    strat_rets, weights_history, turnover = _simulate(
+        prices, key, momentum, momentum.index[lookback::step], n_stocks, weighting, cost_bps,
+        universe=universe)
+    if strat_rets.empty:
+        return None, None, None
+    return strat_rets, weights_history, turnover.mean()
+
+
+def _state_path(config):
+    digest = hashlib.sha1(repr(config).encode()).hexdigest()
+    return os.path.join(BACKTEST_DIR, f"{digest}.parquet")
+
+
+def run_backtest_incremental(prices, lookback, skip, n_stocks, rebal_freq,
+                             weighting, cost_bps, universe=None):
+    """Comme run_backtest, en reprenant l'état enregistré lors d'un appel précédent.
+
+    L'état est propre à la configuration (tickers, première date, paramètres).
+    Il est repris tel quel si la fin des données a seulement avancé ; les
+    ajustements rétroactifs des prix (dividendes) ne sont pas réappliqués
+    aux périodes déjà enregistrées.
+    """
+    if not isinstance(prices, PriceMatrix):
+        prices = PriceMatrix.from_frame(prices)
+    days = prices.dates
+    rebal = rebalance_dates(days, lookback, rebal_freq)
+    if not len(rebal):
+        return None, None, None
+    config = [[str(t) for t in prices.tickers], str(days[0].date()),
+              lookback, skip, n_stocks, rebal_freq, weighting, cost_bps,
+              universe.key if universe is not None else None]
+    path = _state_path(config)
+
+    stored, meta = price_store.read_file(path)
+    resume = None
+    if stored is not None and meta.get("config") == config:
+        resume = pd.Timestamp(meta["checkpoint"])
+        if resume not in rebal or resume >= days[-1]:
+            resume = None  # données raccourcies : on repart de zéro
+
+    if resume is None:
+        done = pd.Series(dtype="float64", index=pd.DatetimeIndex([], name=days.name))
+        weights_history, turnover, previous = {}, done, None
+        window = prices.to_frame()
+    else:
+        done = stored["Rendement"]
+        weights_history = {pd.Timestamp(d): pd.Series(w, dtype="float64")
+                           for d, w in meta["weights"].items()}
+        turnover = pd.Series(meta["turnover"], index=pd.DatetimeIndex(list(weights_history)),
+                             dtype="float64")
+        previous = weights_history[max(weights_history)] if weights_history else None
+        # Le signal et l'éligibilité à la reprise n'utilisent que lookback mois d'historique
+        window_start = (resume - pd.DateOffset(months=lookback)).to_period("M").to_timestamp()
+        window = prices.between(window_start).to_frame()
+
+    key = shared_cache.fingerprint(window)
+    momentum = signals(window, lookback, skip, key)
+    dates = rebal if resume is None else rebal[rebal >= resume]
+    new_rets, new_weights, new_turnover = _simulate(
+        window, key, momentum, dates, n_stocks, weighting, cost_bps, previous, universe)
+    strat_rets = pd.concat([done, new_rets]) if len(done) else new_rets
+    weights_history.update(new_weights)
+    turnover = pd.concat([turnover, new_turnover]) if len(turnover) else new_turnover
+
+    # Nouvel état : dernier rebalancement dont le mois est entièrement connu
+    finished = rebal[rebal < days[-1]]
+    if len(finished) and (resume is None or finished[-1] > resume):
+        checkpoint = finished[-1]
+        kept = strat_rets[strat_rets.index <= checkpoint]
+        price_store.write_file(path, kept.rename("Rendement").to_frame(), {
+            "config": config,
+            "checkpoint": checkpoint.isoformat(),
+            "weights": {d.isoformat(): w.to_dict()
+                        for d, w in weights_history.items() if d < checkpoint},
+            "turnover": turnover[turnover.index < checkpoint].tolist(),
+            "value": float((1 + kept).prod()),
+        })
+
+    if strat_rets.empty:
+        return None, None, None
+    return strat_rets, weights_history, turnover.mean()
+
+
+def performance(rets, freq=252):
+    """Métriques de performance (valeurs numériques), performance cumulée et drawdown."""
+    cum = (1 + rets).cumprod()
+    n_years = len(rets) / freq
+    cagr = cum.iloc[-1] ** (1 / n_years) - 1
+    vol = rets.std() * np.sqrt(freq)
+    sharpe = (rets.mean() * freq) / vol if vol > 0 else np.nan
+    dd = cum / cum.cummax() - 1
+    max_dd = dd.min()
+    calmar = cagr / abs(max_dd) if max_dd < 0 else np.nan
+    return {
+        "CAGR": cagr,
+        "Volatilité": vol,
+        "Sharpe": sharpe,
+        "Max Drawdown": max_dd,
+        "Calmar": calmar,
+        "Perf totale": cum.iloc[-1] - 1,
+    }, cum, dd
+
+
+def bootstrap(rets, n=10000, block=21, level=0.95, freq=252, seed=None, chunk=250):
+    """Intervalles de confiance par bootstrap en blocs (circulaire) des rendements.
+
+    Les `n` rééchantillonnages sont tirés par paquets de `chunk` lignes d'un
+    tableau NumPy (rééchantillonnages × jours) ; les blocs de `block` jours
+    conservent l'autocorrélation de court terme. Moyenne, variance et
+    rendement composé se déduisent des sommes cumulées par bloc ; seul le
+    drawdown parcourt les trajectoires complètes. Sur une série plus courte
+    qu'un bloc, le bloc est ramené à la longueur de la série ; avec moins de
+    deux rendements, les intervalles sont NaN.
+    Retourne un DataFrame métriques × ["Bas", "Haut"].
+    """
+    values = np.asarray(rets, dtype="float64")
+    size = len(values)
+    if size < 2:
+        return pd.DataFrame(np.nan, index=["CAGR", "Sharpe", "Max Drawdown", "Calmar"],
+                            columns=["Bas", "Haut"])
+    block = max(1, min(block, size))
+    n_blocks = -(-size // block)
+    lengths = np.full(n_blocks, block)
+    lengths[-1] = size - block * (n_blocks - 1)
+    log_rets = np.log1p(values)
+    # Tous les blocs possibles (vue glissante sur la série doublée, sans copie)
+    windows = np.lib.stride_tricks.sliding_window_view(np.concatenate([log_rets, log_rets]),
+                                                       block)[:size]
+
+    # Sommes cumulées sur la série doublée : somme d'un bloc = différence de deux lignes
+    def prefix(x):
+        return np.concatenate([[0.0], np.cumsum(np.concatenate([x, x]))])
+    sums, squares, logs = prefix(values), prefix(values ** 2), prefix(log_rets)
+
+    rng = np.random.default_rng(seed)
+    stats = {"CAGR": [], "Sharpe": [], "Max Drawdown": [], "Calmar": []}
+    for done in range(0, n, chunk):
+        starts = rng.integers(0, size, (min(chunk, n - done), n_blocks))
+        ends = starts + lengths
+        total = (sums[ends] - sums[starts]).sum(axis=1)
+        total_sq = (squares[ends] - squares[starts]).sum(axis=1)
+        total_log = (logs[ends] - logs[starts]).sum(axis=1)
+
+        cagr = np.exp(total_log * freq / size) - 1
+        mean = total / size
+        vol = np.sqrt(np.maximum(total_sq - size * mean ** 2, 0) / (size - 1) * freq)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(vol > 0, mean * freq / vol, np.nan)
+
+        paths = windows[starts].reshape(len(starts), -1)[:, :size]
+        log_cum = np.cumsum(paths, axis=1)
+        peak = np.maximum(np.maximum.accumulate(log_cum, axis=1), 0.0)
+        max_dd = np.expm1((log_cum - peak).min(axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            calmar = np.where(max_dd < 0, cagr / np.abs(max_dd), np.nan)
+        for name, value in zip(stats, (cagr, sharpe, max_dd, calmar)):
+            stats[name].append(value)
+
+    tail = (1 - level) / 2
+    return pd.DataFrame({
+        name: np.nanquantile(np.concatenate(values), [tail, 1 - tail])
+        for name, values in stats.items()
+    }, index=["Bas", "Haut"]).T
@@ -0,0 +1,98 @@
+"""
+bars.py — Pyramide de barres multi-échelles (quotidien → hebdomadaire → mensuel).
+
+Les barres hebdomadaires ('W') et mensuelles ('ME') sont dérivées une seule
+fois par ticker à partir des barres quotidiennes du stockage (price_store),
+puis enregistrées à côté d'elles dans BARS_DIR/<échelle>/<ticker>.parquet.
+Quand de nouvelles barres quotidiennes arrivent, seule la dernière barre
+agrégée (éventuellement incomplète) et les suivantes sont recalculées.
+"""
+
+import os
+
+import pandas as pd
+
+import price_store
+import shared_cache
+from market_data import period_start
+from singleflight import group
+
+BARS_DIR = os.environ.get("INDEX_SUIVI_BARS", os.path.join("data", "bars"))
+
+# Échelle (règle resample) -> fréquence de période utilisée pour trouver le début d'une barre
+TIMEFRAMES = {"W": "W-SUN", "ME": "M"}
+AGGREGATIONS = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+_flight = group("barres", ttl=5)
+
+
+def aggregate(daily, rule):
+    """Agrège des barres quotidiennes OHLCV à l'échelle `rule` ('W' ou 'ME')."""
+    agg = {c: AGGREGATIONS[c] for c in daily.columns if c in AGGREGATIONS}
+    return daily.resample(rule).agg(agg)
+
+
+def _path(rule, ticker):
+    return os.path.join(BARS_DIR, rule, f"{ticker.replace('/', '_')}.parquet")
+
+
+def update(ticker, rule, daily):
+    """Retourne les barres `rule` du ticker, mises à jour depuis l'historique quotidien complet.
+
+    - rien en stock, historique quotidien prolongé vers le passé ou réajusté
+      (première clôture modifiée) : agrégation complète ;
+    - nouvelles barres quotidiennes, ou dernière barre corrigée (barre
+      intrajournalière réécrite par price_store) : on ne recalcule qu'à partir
+      du début de la période qui contenait la dernière barre quotidienne déjà
+      agrégée ;
+    - aucun changement : lecture seule.
+    """
+    path = _path(rule, ticker)
+    stored, meta = price_store.read_file(path)
+    first, last = str(daily.index.min()), str(daily.index.max())
+    # Première clôture : change si l'historique quotidien a été réajusté (split, dividende)
+    first_close = float(daily["Close"].iloc[0]) if "Close" in daily else None
+    last_close = float(daily["Close"].iloc[-1]) if "Close" in daily else None
+    if (stored is not None and meta.get("daily_first") == first
+            and meta.get("first_close") == first_close):
+        if (meta.get("daily_last") == last and meta.get("daily_rows") == len(daily)
+                and meta.get("last_close") == last_close):
+            return stored
+        begin = pd.Timestamp(meta["daily_last"]).to_period(TIMEFRAMES[rule]).start_time
+        bars = pd.concat([stored.loc[stored.index < begin], aggregate(daily.loc[begin:], rule)])
+    else:
+        bars = aggregate(daily, rule)
+    price_store.write_file(path, bars, {"daily_first": first, "daily_last": last,
+                                        "daily_rows": len(daily), "first_close": first_close,
+                                        "last_close": last_close})
+    return bars
+
+
+def get_many(tickers, rule, period=None, start=None, end=None, errors=None):
+    """Barres pré-agrégées de plusieurs tickers : dict ticker -> DataFrame.
+
+    Même interface que price_store.get_many, avec l'échelle `rule` en plus.
+    """
+    start = pd.Timestamp(start) if start is not None else period_start(period)
+    tickers = tuple(t for t in tickers if t)
+
+    def load():
+        failures = {}
+        daily = price_store.ensure_many(tickers, start, failures)
+        return {t: price_store.slice_dates(update(t, rule, frame), start, end)
+                for t, frame in daily.items() if not frame.empty}, failures
+
+    data, failures = _flight.do((tickers, rule, start, end), load)
+    if errors is not None:
+        errors.update(failures)
+    return data
+
+
+def resample_close(prices, rule):
+    """Clôtures agrégées d'une matrice de prix (dates × tickers), dernière valeur de chaque période.
+
+    Le résultat est publié dans le cache partagé, indexé par l'empreinte des
+    prix : chaque matrice n'est agrégée qu'une fois, tous processus confondus.
+    """
+    key = ("close", rule, shared_cache.fingerprint(prices))
+    return shared_cache.get_or_compute(key, lambda: prices.resample(rule).last())
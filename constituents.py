@@ -0,0 +1,139 @@
+"""
+constituents.py — Composition historique (point-in-time) des indices.
+
+Les pages momentum récupèrent la composition *actuelle* d'un indice ; un
+backtest sur cet univers ignore les titres sortis entre-temps (biais du
+survivant). Ce module garde, par indice, la liste des entrées / sorties
+enregistrées (Date, Added, Removed) et la composition actuelle, dans un
+fichier Parquet de CONSTITUENTS_DIR. Membership en déduit des intervalles
+d'appartenance [entrée, sortie) par ticker :
+- members(date) : composition à une date ;
+- mask(dates, tickers) : matrice booléenne dates × tickers en une opération
+  (sommes cumulées d'événements entrée / sortie).
+
+Le backtest télécharge une seule fois l'union des membres de la période,
+puis masque le signal à chaque rebalancement.
+"""
+
+import hashlib
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import price_store
+
+CONSTITUENTS_DIR = os.environ.get("INDEX_SUIVI_CONSTITUENTS", os.path.join("data", "constituents"))
+
+CHANGE_COLUMNS = ["Date", "Added", "Removed"]
+
+
+def _path(index):
+    return os.path.join(CONSTITUENTS_DIR, f"{index}.parquet")
+
+
+def _normalize(changes):
+    """Table des changements : Date (sans heure), Added / Removed (NaN si vide)."""
+    changes = changes[CHANGE_COLUMNS].copy()
+    changes["Date"] = pd.to_datetime(changes["Date"], errors="coerce").dt.normalize()
+    for column in ("Added", "Removed"):
+        changes[column] = changes[column].where(changes[column].notna() & (changes[column] != ""))
+    changes = changes.dropna(subset=["Date"])
+    return changes.drop_duplicates().sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+class Membership:
+    """Appartenance historique à un indice : intervalles [start, end) par ticker.
+
+    `start` NaT : membre depuis toujours (avant le premier changement connu) ;
+    `end` NaT : toujours membre.
+    """
+
+    def __init__(self, intervals):
+        self.intervals = intervals.reset_index(drop=True)
+
+    @classmethod
+    def from_changes(cls, current, changes):
+        """Reconstitue les intervalles en remontant les changements depuis la composition actuelle."""
+        rows = []
+        open_end = {ticker: pd.NaT for ticker in current}
+        for change in _normalize(changes).iloc[::-1].itertuples(index=False):
+            if pd.notna(change.Added) and change.Added in open_end:
+                rows.append((change.Added, change.Date, open_end.pop(change.Added)))
+            if pd.notna(change.Removed) and change.Removed not in open_end:
+                open_end[change.Removed] = change.Date
+        rows.extend((ticker, pd.NaT, end) for ticker, end in open_end.items())
+        intervals = pd.DataFrame(rows, columns=["ticker", "start", "end"])
+        intervals[["start", "end"]] = intervals[["start", "end"]].astype("datetime64[ns]")
+        return cls(intervals.sort_values(["ticker", "start"], na_position="first"))
+
+    @property
+    def has_history(self):
+        """Vrai si au moins une entrée ou sortie est connue."""
+        return bool(self.intervals["start"].notna().any() or self.intervals["end"].notna().any())
+
+    @property
+    def key(self):
+        """Empreinte des intervalles (clé de cache)."""
+        text = self.intervals.to_csv(index=False, date_format="%Y-%m-%d")
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def tickers(self, start=None, end=None):
+        """Tickers membres à un moment quelconque de [start, end]."""
+        overlap = pd.Series(True, index=self.intervals.index)
+        if start is not None:
+            overlap &= self.intervals["end"].isna() | (self.intervals["end"] > pd.Timestamp(start))
+        if end is not None:
+            overlap &= self.intervals["start"].isna() | (self.intervals["start"] <= pd.Timestamp(end))
+        return sorted(set(self.intervals.loc[overlap, "ticker"]))
+
+    def members(self, date):
+        """Composition de l'indice à la date `date`."""
+        return self.tickers(date, date)
+
+    def mask(self, dates, tickers):
+        """Matrice booléenne dates × tickers : membre de l'indice à chaque date."""
+        dates = pd.DatetimeIndex(dates)
+        columns = pd.Index(tickers).get_indexer(self.intervals["ticker"])
+        known = columns >= 0
+        start = self.intervals["start"].to_numpy()[known]
+        end = self.intervals["end"].to_numpy()[known]
+        columns = columns[known]
+
+        days = dates.values
+        first = np.where(np.isnat(start), 0, days.searchsorted(start, side="left"))
+        last = np.where(np.isnat(end), len(dates), days.searchsorted(end, side="left"))
+        events = np.zeros((len(dates) + 1, len(tickers)), dtype="int32")
+        np.add.at(events, (first, columns), 1)
+        np.add.at(events, (last, columns), -1)
+        return np.cumsum(events, axis=0)[:-1] > 0
+
+
+def record(index, current, changes=None, **meta):
+    """Enregistre la composition actuelle de `index` et, si fournie, sa liste de changements.
+
+    Sans `changes`, la liste déjà enregistrée est conservée (elle peut avoir
+    été importée à la main : colonnes Date, Added, Removed). Les arguments
+    nommés sont ajoutés aux métadonnées (secteurs, validateurs HTTP...).
+    """
+    stored, _ = price_store.read_file(_path(index))
+    if changes is None:
+        changes = stored if stored is not None else pd.DataFrame(columns=CHANGE_COLUMNS)
+    changes = _normalize(changes).astype({"Added": "object", "Removed": "object"})
+    price_store.write_file(_path(index), changes,
+                           {**meta, "current": list(current), "updated": time.time()})
+
+
+def snapshot(index):
+    """Métadonnées de la dernière composition enregistrée de `index` ({} si aucune)."""
+    _, meta = price_store.read_file(_path(index))
+    return meta
+
+
+def load(index):
+    """Membership de `index` depuis le stockage local, ou None si rien n'est enregistré."""
+    changes, meta = price_store.read_file(_path(index))
+    if changes is None:
+        return None
+    return Membership.from_changes(meta["current"], changes)
@@ -0,0 +1,27 @@
+"""
+differential.py — Courbes différentielles (ticker / référence) calculées en bloc.
+
+Au lieu de rediviser chaque ticker par la référence dans une boucle, on aligne
+toutes les clôtures dans une matrice (semaines × tickers) et on calcule en une
+seule passe vectorisée la matrice des ratios et leur moyenne mobile.
+Les graphiques n'ont plus qu'à en extraire une colonne.
+"""
+
+import pandas as pd
+
+
+def close_matrix(bars):
+    """Aligne les clôtures d'un dict ticker -> barres OHLC en une matrice dates × tickers."""
+    return pd.DataFrame({t: frame["Close"] for t, frame in bars.items()
+                         if frame is not None and not frame.empty})
+
+
+def ratio_matrix(closes, ref_ticker, sma_period=None):
+    """Divise chaque colonne de `closes` par la colonne de référence.
+
+    Retourne (ratios, sma) : deux DataFrames dates × tickers (référence exclue) ;
+    `sma` vaut None si aucune période n'est demandée.
+    """
+    ratios = closes.drop(columns=ref_ticker).div(closes[ref_ticker], axis=0)
+    sma = ratios.rolling(window=sma_period).mean() if sma_period else None
+    return ratios, sma
@@ -1,40 +1,48 @@
 # dividend.py
 
-import yfinance as yf
 import pandas as pd
 from datetime import datetime
+from fetch_pool import get_pool
+import dividend_ledger
 
-# Récupérer les dividendes annuels pour une action
+# Récupérer les dividendes annuels pour une action (agrégats du registre local,
+# synchronisé de façon incrémentale)
 def get_annual_dividends(ticker_symbol, start_year=2023):
-    ticker = yf.Ticker(ticker_symbol)
-    dividends = ticker.dividends
-
-    if not dividends.empty:
-        dividends.index = pd.to_datetime(dividends.index)
-        dividends_df = dividends.to_frame(name='Dividends')
-        dividends_df['Year'] = dividends_df.index.year
-        dividends_by_year = dividends_df.groupby('Year')['Dividends'].sum().reset_index()
-        dividends_by_year = dividends_by_year[dividends_by_year['Year'] >= start_year]
-        dividends_by_year['Year'] = dividends_by_year['Year'].astype(str)
-        dividends_by_year.rename(columns={'Dividends': ticker_symbol}, inplace=True)
-        return dividends_by_year
+    dividends_by_year = dividend_ledger.yearly(ticker_symbol)
+    dividends_by_year = dividends_by_year[dividends_by_year.index >= start_year]
+
+    if not dividends_by_year.empty:
+        return pd.DataFrame({'Year': dividends_by_year.index.astype(str),
+                             ticker_symbol: dividends_by_year.values})
 
     return pd.DataFrame(columns=['Year', ticker_symbol])
 
-# Nouvelle fonction principale pour récupérer les dividendes pour tous les tickers
-def get_dividends():
-    all_dividends = {}
+# Fonction principale : dividendes par année pour tous les tickers, en un seul
+# DataFrame (index 'Year' en texte, une colonne par ticker, NaN si aucun versement)
+def get_dividends(start_year=2023):
     try:
         with open("actions_list.txt", "r") as file:
             tickers = [line.strip() for line in file if line.strip()]
-
-        for ticker in tickers:
-            dividends_by_year = get_annual_dividends(ticker, start_year=2023)
-            if not dividends_by_year.empty:
-                all_dividends[ticker] = dividends_by_year
-            else:
-                all_dividends[ticker] = pd.DataFrame(columns=['Year', ticker])
     except FileNotFoundError:
         print("Erreur : Le fichier actions_list.txt est introuvable.")
+        return pd.DataFrame(index=pd.Index([], name='Year', dtype=str))
 
+    # Registres à jour : simple lecture locale. Les autres sont synchronisés en
+    # parallèle ; un ticker en échec n'interrompt pas les autres.
+    fresh = [t for t in tickers if dividend_ledger.is_fresh(t)]
+    stale = [t for t in tickers if t not in fresh]
+    yearly = {t: dividend_ledger.yearly(t) for t in fresh}
+    results, errors = get_pool().map(dividend_ledger.yearly, stale)
+    yearly.update(results)
+    for ticker, e in errors.items():
+        print(f"Erreur lors de la récupération des dividendes pour {ticker} : {e}")
+
+    all_dividends = pd.DataFrame(yearly, columns=tickers).sort_index()
+    all_dividends = all_dividends[all_dividends.index >= start_year]
+    all_dividends.index = all_dividends.index.astype(str).rename('Year')
     return all_dividends
+
+# Dividendes versés sur les 12 derniers mois pour chaque ticker (agrégat du
+# registre local, à jour après get_dividends)
+def get_trailing_dividends(tickers):
+    return pd.Series({t: dividend_ledger.trailing_12m(t) for t in tickers}, dtype=float)
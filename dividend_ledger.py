@@ -0,0 +1,118 @@
+"""
+dividend_ledger.py — Registre local des dividendes, synchronisé de façon incrémentale.
+
+Un fichier Parquet par ticker dans LEDGER_DIR contient tous les versements
+connus. Une synchronisation ne demande au fournisseur que les versements
+postérieurs au dernier enregistré, et au plus une fois par SYNC_SECONDS.
+Les agrégats (somme par année civile, somme sur 12 mois glissants) sont
+conservés dans les métadonnées du fichier et ne sont recalculés que lorsqu'un
+nouveau versement arrive (ou, pour les 12 mois glissants, quand la date change).
+"""
+
+import os
+import time
+
+import pandas as pd
+
+from market_data import get_provider
+from price_store import read_file, write_file
+from singleflight import group
+
+LEDGER_DIR = os.environ.get("INDEX_SUIVI_DIVIDENDS", os.path.join("data", "dividends"))
+
+# Délai (secondes) entre deux interrogations du fournisseur pour un même ticker
+SYNC_SECONDS = 12 * 3600
+
+# Requêtes identiques concurrentes (plusieurs sessions) : un seul téléchargement
+_flight = group("dividendes", ttl=5)
+
+
+def _path(ticker):
+    return os.path.join(LEDGER_DIR, f"{ticker.replace('/', '_')}.parquet")
+
+
+def _normalize(dividends):
+    """Series de versements -> DataFrame 'Dividends' indexé par date sans fuseau."""
+    dividends = dividends[dividends > 0]
+    ledger = dividends.rename("Dividends").to_frame()
+    ledger.index = pd.DatetimeIndex(ledger.index).tz_localize(None).rename("Date")
+    return ledger.astype("float64")
+
+
+def _trailing_12m(ledger, today):
+    """Somme des versements des 12 derniers mois à la date `today`."""
+    since = pd.Timestamp(today) - pd.DateOffset(years=1)
+    return float(ledger.loc[ledger.index > since, "Dividends"].sum())
+
+
+def _aggregates(ledger, today):
+    yearly = ledger["Dividends"].groupby(ledger.index.year).sum()
+    return {
+        "yearly": {str(year): float(value) for year, value in yearly.items()},
+        "ttm": _trailing_12m(ledger, today),
+        "ttm_date": today,
+    }
+
+
+def is_fresh(ticker):
+    """Vrai si le registre a été synchronisé récemment (aucun appel réseau nécessaire)."""
+    _, meta = read_file(_path(ticker))
+    return time.time() - meta.get("synced", 0) < SYNC_SECONDS
+
+
+def sync(ticker):
+    """Met à jour le registre d'un ticker et retourne (registre, métadonnées)."""
+    return _flight.do(ticker, lambda: _sync(ticker))
+
+
+def _sync(ticker):
+    path = _path(ticker)
+    ledger, meta = read_file(path)
+    now = time.time()
+    today = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+    if ledger is not None and now - meta.get("synced", 0) < SYNC_SECONDS:
+        if meta.get("ttm_date") != today:
+            meta.update(_aggregates(ledger, today))
+            write_file(path, ledger, meta)
+        return ledger, meta
+
+    if ledger is None or ledger.empty:
+        # Premier passage : tout l'historique
+        new = _normalize(get_provider().dividends(ticker))
+        ledger, appended = new, True
+    else:
+        # Seulement les versements postérieurs au dernier connu
+        since = ledger.index.max() + pd.Timedelta(days=1)
+        new = _normalize(get_provider().dividends(ticker, start=since))
+        new = new[new.index > ledger.index.max()]
+        appended = not new.empty
+        if appended:
+            ledger = pd.concat([ledger, new]).sort_index()
+
+    if appended or meta.get("ttm_date") != today:
+        meta.update(_aggregates(ledger, today))
+    meta["synced"] = now
+    write_file(path, ledger, meta)
+    return ledger, meta
+
+
+def yearly(ticker):
+    """Dividendes par année civile : Series indexée par année (int)."""
+    _, meta = sync(ticker)
+    yearly = meta.get("yearly", {})
+    return pd.Series({int(year): value for year, value in yearly.items()}, dtype="float64")
+
+
+def trailing_12m(ticker):
+    """Somme des dividendes versés sur les 12 derniers mois."""
+    _, meta = sync(ticker)
+    return meta.get("ttm", 0.0)
+
+
+def payments(ticker):
+    """Versements enregistrés (sans synchronisation) : Series indexée par date de détachement."""
+    ledger, _ = read_file(_path(ticker))
+    if ledger is None:
+        return pd.Series(dtype="float64", name="Dividends")
+    return ledger["Dividends"]
@@ -0,0 +1,104 @@
+"""
+fetch_pool.py — Téléchargements concurrents, bornés et limités en débit.
+
+Utilisé quand la requête groupée n'est pas possible (contrats à terme `GC=F`,
+paires de devises `EURUSD=X`, classes d'actifs mélangées) et pour les
+dividendes, qui se récupèrent ticker par ticker.
+
+- nombre de threads borné (MAX_WORKERS) ;
+- plafond de requêtes par seconde partagé par tous les threads ;
+- nouvelles tentatives avec back-off exponentiel quand le fournisseur limite ;
+- résultats partiels : un ticker en échec n'interrompt pas les autres.
+
+Réglages par variables d'environnement :
+    INDEX_SUIVI_FETCH_WORKERS  (défaut : 8)
+    INDEX_SUIVI_FETCH_RPS      (défaut : 4 requêtes/s, 0 = illimité)
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from market_data import is_throttling
+
+MAX_WORKERS = int(os.environ.get("INDEX_SUIVI_FETCH_WORKERS", "8"))
+REQUESTS_PER_SECOND = float(os.environ.get("INDEX_SUIVI_FETCH_RPS", "4"))
+RETRIES = 4
+BACKOFF_SECONDS = 1.0
+
+
+class RateLimiter:
+    """Espace les appels d'au moins 1/rate seconde, tous threads confondus."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchPool:
+    """Pool de threads exécutant une fonction de téléchargement par clé."""
+
+    def __init__(self, max_workers=MAX_WORKERS, rate=REQUESTS_PER_SECOND,
+                 retries=RETRIES, backoff=BACKOFF_SECONDS, retry_on=is_throttling):
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_on = retry_on
+
+    def _call(self, fn, key):
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                return fn(key)
+            except Exception as exc:
+                if attempt == self.retries or not self.retry_on(exc):
+                    raise
+                # Back-off exponentiel avec un peu d'aléa pour désynchroniser les threads
+                time.sleep(self.backoff * 2 ** attempt * (1 + random.random() / 4))
+
+    def map(self, fn, keys):
+        """Applique `fn` à chaque clé en parallèle.
+
+        Retourne (résultats, erreurs) : deux dicts clé -> valeur / exception.
+        Les résultats conservent l'ordre des clés.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}, {}
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(keys))) as executor:
+            futures = {executor.submit(self._call, fn, key): key for key in keys}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as exc:
+                    errors[key] = exc
+        return {k: results[k] for k in keys if k in results}, errors
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Pool partagé par le processus (le plafond de débit est donc global)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = FetchPool()
+    return _pool
@@ -0,0 +1,225 @@
+"""
+market_data.py — Fournisseurs de données de marché.
+
+Toutes les pages passent par get_provider() au lieu d'appeler yfinance
+directement :
+- YFinanceProvider : données réelles (réseau) ;
+- ReplayProvider   : rejoue des fixtures enregistrées (CSV) pour des exécutions
+                     déterministes et hors ligne (benchmarks, tests de charge) ;
+- RecordingProvider: enveloppe un fournisseur et enregistre ses réponses au
+                     format lu par ReplayProvider.
+
+Sélection par variable d'environnement :
+    INDEX_SUIVI_PROVIDER=yfinance|replay|record   (défaut : yfinance)
+    INDEX_SUIVI_FIXTURES=<dossier des fixtures>    (défaut : fixtures)
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+FIXTURES_DIR = os.environ.get("INDEX_SUIVI_FIXTURES", "fixtures")
+
+
+def period_start(period, today=None):
+    """Convertit une période yfinance ('5d', '6mo', '2y', 'ytd', 'max') en date de début.
+
+    Retourne None pour 'max' (tout l'historique disponible).
+    """
+    today = pd.Timestamp(today) if today is not None else pd.Timestamp.today()
+    today = today.normalize()
+    if period is None or period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+    for suffix, offset in (("mo", "months"), ("wk", "weeks"), ("y", "years"), ("d", "days")):
+        if period.endswith(suffix):
+            n = int(period[: -len(suffix)])
+            return today - pd.DateOffset(**{offset: n})
+    raise ValueError(f"Période non reconnue : {period}")
+
+
+def is_throttling(exc):
+    """Vrai si l'exception signale une limitation de débit du fournisseur."""
+    return isinstance(exc, YFRateLimitError) or "Too Many Requests" in str(exc)
+
+
+def _clean(frame):
+    """Normalise une table OHLCV : colonnes standard, index de dates sans fuseau."""
+    frame = frame[[c for c in OHLCV_COLUMNS if c in frame.columns]].dropna(how="all")
+    frame.index = pd.DatetimeIndex(frame.index).tz_localize(None)
+    frame.index.name = "Date"
+    return frame
+
+
+class MarketDataProvider(ABC):
+    """Interface commune des fournisseurs de données (un fournisseur incomplet
+    ne peut pas être instancié)."""
+
+    @abstractmethod
+    def history(self, tickers, start=None, end=None, period=None):
+        """Barres OHLCV quotidiennes ajustées : dict ticker -> DataFrame.
+
+        `start`/`end` (end exclu, comme yfinance) ou `period` ('2y', 'max'...).
+        Les tickers sans données sont absents du résultat.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def dividends(self, ticker, start=None):
+        """Dividendes versés (depuis `start` si fourni) : Series indexée par date."""
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Données réelles via yfinance (une seule requête groupée par appel).
+
+    yf.download partage un état global entre appels : les requêtes groupées
+    sont donc sérialisées, et un ticker isolé passe par Ticker.history, qui
+    peut être appelé depuis plusieurs threads (voir fetch_pool).
+    """
+
+    _download_lock = threading.Lock()
+
+    def history(self, tickers, start=None, end=None, period=None):
+        tickers = list(tickers)
+        if start is None and end is None:
+            period = period or "max"
+        if len(tickers) == 1:
+            data = yf.Ticker(tickers[0]).history(start=start, end=end, period=period,
+                                                 auto_adjust=True, raise_errors=True)
+            data = _clean(data)
+            return {tickers[0]: data} if not data.empty else {}
+        with self._download_lock:
+            data = yf.download(tickers, start=start, end=end, period=period,
+                               auto_adjust=True, progress=False)
+        if data is None or data.empty:
+            return {}
+        if not isinstance(data.columns, pd.MultiIndex):
+            data = pd.concat({tickers[0]: data}, axis=1).swaplevel(axis=1)
+
+        # Découpage du résultat MultiIndex (Price, Ticker) ticker par ticker
+        frames = {}
+        for ticker in data.columns.get_level_values("Ticker").unique():
+            frame = _clean(data.xs(ticker, axis=1, level="Ticker"))
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def dividends(self, ticker, start=None):
+        if start is None:
+            return yf.Ticker(ticker).dividends
+        # Seulement les versements récents : on évite de retélécharger tout l'historique
+        actions = yf.Ticker(ticker).history(start=start, auto_adjust=True, actions=True)
+        if actions.empty or "Dividends" not in actions:
+            return pd.Series(dtype=float, name="Dividends")
+        dividends = actions["Dividends"]
+        return dividends[dividends > 0]
+
+
+class ReplayProvider(MarketDataProvider):
+    """Rejoue des fixtures locales.
+
+    Arborescence attendue :
+        <root>/prices/<ticker>.csv     colonnes Date,Open,High,Low,Close,Volume
+        <root>/dividends/<ticker>.csv  colonnes Date,Dividends
+
+    Les périodes relatives ('2y'...) sont calculées depuis la dernière date de
+    la fixture, pour que le résultat ne dépende pas du jour d'exécution.
+    """
+
+    def __init__(self, root=FIXTURES_DIR):
+        self.root = root
+
+    def _file(self, kind, ticker):
+        return os.path.join(self.root, kind, f"{ticker.replace('/', '_')}.csv")
+
+    def history(self, tickers, start=None, end=None, period=None):
+        frames = {}
+        for ticker in tickers:
+            path = self._file("prices", ticker)
+            if not os.path.exists(path):
+                continue
+            frame = _clean(pd.read_csv(path, index_col="Date", parse_dates=True))
+            first = start
+            if start is None and end is None and period is not None:
+                first = period_start(period, today=frame.index.max())
+            if first is not None:
+                frame = frame.loc[frame.index >= pd.Timestamp(first)]
+            if end is not None:
+                frame = frame.loc[frame.index < pd.Timestamp(end)]
+            if not frame.empty:
+                frames[ticker] = frame
+        return frames
+
+    def dividends(self, ticker, start=None):
+        path = self._file("dividends", ticker)
+        if not os.path.exists(path):
+            return pd.Series(dtype=float, name="Dividends")
+        dividends = pd.read_csv(path, index_col="Date", parse_dates=True)["Dividends"]
+        if start is not None:
+            dividends = dividends[dividends.index >= pd.Timestamp(start)]
+        return dividends
+
+
+class RecordingProvider(MarketDataProvider):
+    """Enveloppe un fournisseur et enregistre ses réponses comme fixtures."""
+
+    def __init__(self, inner, root=FIXTURES_DIR):
+        self.inner = inner
+        self.replay = ReplayProvider(root)
+
+    def history(self, tickers, start=None, end=None, period=None):
+        frames = self.inner.history(tickers, start=start, end=end, period=period)
+        os.makedirs(os.path.join(self.replay.root, "prices"), exist_ok=True)
+        for ticker, frame in frames.items():
+            path = self.replay._file("prices", ticker)
+            if os.path.exists(path):
+                old = pd.read_csv(path, index_col="Date", parse_dates=True)
+                frame = pd.concat([old, frame])
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            frame.to_csv(path)
+        return frames
+
+    def dividends(self, ticker, start=None):
+        dividends = self.inner.dividends(ticker, start=start)
+        os.makedirs(os.path.join(self.replay.root, "dividends"), exist_ok=True)
+        out = dividends.rename("Dividends")
+        out.index = pd.DatetimeIndex(out.index).tz_localize(None)
+        path = self.replay._file("dividends", ticker)
+        if start is not None and os.path.exists(path):
+            old = pd.read_csv(path, index_col="Date", parse_dates=True)["Dividends"]
+            out = pd.concat([old, out])
+            out = out[~out.index.duplicated(keep="last")].sort_index()
+        out.rename_axis("Date").to_csv(path)
+        return dividends
+
+
+_provider = None
+
+
+def set_provider(provider):
+    """Remplace le fournisseur utilisé par toutes les pages."""
+    global _provider
+    _provider = provider
+
+
+def get_provider():
+    """Retourne le fournisseur courant (choisi par INDEX_SUIVI_PROVIDER)."""
+    global _provider
+    if _provider is None:
+        kind = os.environ.get("INDEX_SUIVI_PROVIDER", "yfinance")
+        if kind == "replay":
+            _provider = ReplayProvider()
+        elif kind == "record":
+            _provider = RecordingProvider(YFinanceProvider())
+        elif kind == "yfinance":
+            _provider = YFinanceProvider()
+        else:
+            raise ValueError(f"Fournisseur de données inconnu : {kind}")
+    return _provider
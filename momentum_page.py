@@ -0,0 +1,514 @@
+"""
+momentum_page.py — Page Streamlit commune des stratégies momentum.
+
+Signal 12-1 classique avec paramètres configurables, pour n'importe quel
+univers de universes.py : render(universe) construit toute la page.
+
+Toutes les pages partagent les mêmes caches :
+- historiques de prix dans price_store (un fichier par ticker) : un titre ou
+  un indice de référence commun à plusieurs univers n'est téléchargé qu'une
+  fois, puis seulement complété. Le téléchargement se fait par paquets
+  enregistrés au fil de l'eau (reprise après interruption, barre de
+  progression, backtest possible sur les prix déjà reçus) ;
+- matrices de prix et signaux dans shared_cache (fichiers projetés en
+  mémoire, clés indépendantes de la page).
+"""
+
+from types import SimpleNamespace
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+import constituents
+import price_store
+import shared_cache
+from backtest import bootstrap, performance, run_backtest_incremental
+from price_matrix import PriceMatrix
+from rolling import METRICS as ROLLING_METRICS, RollingMetrics
+from sweep import METRICS, heatmap_table, run_sweep, walk_forward
+from universes import snapshot
+
+# Taille des paquets de téléchargement des prix (un paquet = une requête groupée)
+CHUNK_SIZE = 50
+
+
+# ---------------------------------------------------------------
+# Sidebar : paramètres
+# ---------------------------------------------------------------
+def _sidebar(universe):
+    """Widgets de la barre latérale : retourne les paramètres choisis."""
+    cfg = SimpleNamespace()
+    with st.sidebar:
+        st.header("⚙️ Paramètres")
+
+        cfg.start_date = st.date_input("Date de début", value=pd.to_datetime(universe.start))
+        cfg.end_date = st.date_input("Date de fin", value=pd.to_datetime("today"))
+
+        mode = st.radio("Mode", ["Backtest unique", "Balayage de paramètres", "Walk-forward"],
+                        help="Le balayage et le walk-forward évaluent toutes les "
+                             "combinaisons en parallèle")
+        cfg.sweep_mode = mode == "Balayage de paramètres"
+        cfg.walk_mode = mode == "Walk-forward"
+
+        if not (cfg.sweep_mode or cfg.walk_mode):
+            st.subheader("Signal momentum")
+            cfg.lookback = st.slider("Période de lookback (mois)", 3, 12, 12)
+            cfg.skip = st.slider("Mois exclus (skip récent)", 0, 3, 1)
+
+            st.subheader("Portefeuille")
+            cfg.n_stocks = st.slider("Nombre de titres détenus", 5, 100, 30, step=5)
+            cfg.rebal_freq = st.selectbox("Fréquence de rebalancement",
+                                          ["Mensuel", "Trimestriel"], index=0)
+            cfg.weighting = st.selectbox("Pondération",
+                                         ["Égale", "Proportionnelle au momentum"])
+        else:
+            st.subheader("Grille de paramètres")
+            cfg.grid = {
+                "lookback": st.multiselect("Lookbacks (mois)", list(range(3, 13)), [6, 9, 12]),
+                "skip": st.multiselect("Mois exclus", [0, 1, 2, 3], [0, 1]),
+                "n_stocks": st.multiselect("Nombres de titres", list(range(5, 105, 5)),
+                                           [10, 20, 30, 50]),
+                "rebal_freq": st.multiselect("Rebalancements", ["Mensuel", "Trimestriel"],
+                                             ["Mensuel"]),
+                "weighting": st.multiselect("Pondérations",
+                                            ["Égale", "Proportionnelle au momentum"],
+                                            ["Égale"]),
+            }
+        if cfg.walk_mode:
+            st.subheader("Fenêtres")
+            cfg.train_months = st.slider("Apprentissage (mois)", 12, 60, 36, step=6)
+            cfg.test_months = st.slider("Test (mois)", 3, 24, 12, step=3)
+            cfg.expanding = st.radio("Fenêtre d'apprentissage", ["Glissante", "Croissante"],
+                                     horizontal=True) == "Croissante"
+            cfg.wf_metric = st.selectbox("Critère de sélection", ["Sharpe", "CAGR", "Calmar"])
+
+        st.subheader("Coûts")
+        cfg.cost_bps = st.slider("Coûts de transaction (bps par trade)", 0, 50, 10)
+        if cfg.sweep_mode or cfg.walk_mode:
+            cfg.grid["cost_bps"] = [cfg.cost_bps]
+
+        st.subheader("Univers")
+        cfg.max_tickers = st.slider("Nb max de tickers téléchargés", 50, 503, 503,
+                                    help="Réduire pour un test rapide")
+        cfg.point_in_time = st.checkbox("Composition historique de l'indice", value=True,
+                                        help="Seuls les membres de l'indice à chaque "
+                                             "rebalancement sont éligibles (entrées / "
+                                             "sorties enregistrées)")
+        cfg.local_only = st.checkbox("Démarrer sur les prix déjà téléchargés", value=False,
+                                     help="Aucune requête : backtest sur les titres déjà "
+                                          "enregistrés (téléchargement interrompu)")
+        cfg.low_precision = st.checkbox("Prix en float32", value=False,
+                                        help="Divise par deux la mémoire occupée par les prix")
+
+        st.subheader("Statistiques")
+        cfg.n_boot = 10000 if st.checkbox("Intervalles de confiance (bootstrap)", value=False,
+                                          help="10 000 rééchantillonnages par blocs de 21 "
+                                               "jours") else 0
+
+        cfg.run = st.button("🚀 Lancer le backtest", type="primary", use_container_width=True)
+    return cfg
+
+
+# ---------------------------------------------------------------
+# Fonctions données (mises en cache)
+# ---------------------------------------------------------------
+def download_prices(tickers, start, end, dtype="float64", min_coverage=0.6,
+                    progress=None, local=False):
+    """Prix ajustés (dividendes inclus), partagés entre processus pendant 24 h.
+
+    Les tickers cotés moins de `min_coverage` de la période sont écartés.
+    `local` : uniquement les historiques déjà stockés (aucune requête) ; une
+    matrice complète déjà en cache peut être servie, mais une lecture locale
+    n'est jamais publiée (elle peut être périmée ou partielle).
+    Une matrice incomplète (paquets en échec) n'est pas mise en cache : le
+    prochain lancement reprend les tickers manquants.
+    Retourne (PriceMatrix, tickers non obtenus) ; la matrice peut être en float32.
+    """
+    key = ("prices", tickers, str(start), str(end), dtype, min_coverage)
+    frame = shared_cache.get(key, max_age=86400)
+    if frame is not None:
+        return PriceMatrix.from_frame(frame), []
+
+    closes, failed = _download_closes(tickers, start, end, progress, local)
+    frame = _price_frame(closes, min_coverage).astype(dtype)
+    if not failed and not local:
+        frame = shared_cache.put(key, frame)
+    return PriceMatrix.from_frame(frame), failed
+
+
+def _download_closes(tickers, start, end, progress=None, local=False):
+    """Clôtures ajustées, par paquets de CHUNK_SIZE tickers.
+
+    Chaque paquet est enregistré dans price_store dès sa réception : après
+    une interruption, les paquets déjà reçus sont relus localement et seul le
+    reste est demandé. Un paquet en échec n'interrompt pas les suivants.
+    `progress(fait, total)` est appelé après chaque paquet.
+    Retourne ({ticker: Series}, tickers en échec).
+    """
+    closes, failed = {}, []
+    for i in range(0, len(tickers), CHUNK_SIZE):
+        chunk = tickers[i:i + CHUNK_SIZE]
+        errors = {}
+        try:
+            if local:
+                frames = price_store.get_stored(chunk, start, end)
+                errors = {t: None for t in chunk if t not in frames}
+            else:
+                frames = price_store.get_many(chunk, start=start, end=end, errors=errors)
+        except Exception as e:
+            frames, errors = {}, dict.fromkeys(chunk, e)
+        closes.update((t, f["Close"]) for t, f in frames.items())
+        failed += [t for t in chunk if t in errors and t not in frames]
+        if progress:
+            progress(min(i + CHUNK_SIZE, len(tickers)), len(tickers))
+    return closes, failed
+
+
+def _price_frame(closes, min_coverage=0.6):
+    """Matrice dates × tickers des clôtures, sur un calendrier commun."""
+    prices = pd.DataFrame(closes).sort_index()
+    prices = prices.dropna(axis=1, thresh=max(int(len(prices) * min_coverage), 1))
+
+    # 🔑 Aligne tous les tickers sur un calendrier commun et bouche les
+    #    petits trous (jours fériés européens décalés)
+    prices = prices.ffill(limit=5)
+
+    return prices
+
+
+def download_benchmark(ticker, start, end):
+    frame = shared_cache.get_or_compute(
+        ("benchmark", ticker, str(start), str(end)),
+        lambda: price_store.get_history(ticker, start=start, end=end)[["Close"]],
+        max_age=86400)
+    return frame["Close"]
+
+
+def load_universe(universe, cfg, months):
+    """Prix depuis `months` mois avant la date de début.
+
+    Avec la composition historique, l'univers est l'union des membres de
+    l'indice sur la période (titres entrés ou sortis en cours de route compris).
+    Retourne (prix, secteurs, composition historique ou None).
+    """
+    try:
+        with st.spinner(f"📥 Récupération de la liste {universe.name}..."):
+            tickers, sectors = snapshot(universe)
+    except Exception as e:
+        st.error(f"Composition {universe.name} indisponible (aucun instantané local) : {e}")
+        st.stop()
+    n_current = len(tickers)
+
+    # On télécharge avec une marge pour calculer le momentum dès le début
+    buffer_start = pd.to_datetime(cfg.start_date) - pd.DateOffset(months=months)
+    membership = constituents.load(universe.key) if cfg.point_in_time else None
+    if membership is not None and membership.has_history:
+        tickers = membership.tickers(buffer_start, cfg.end_date)
+    else:
+        membership = None
+    if cfg.max_tickers < n_current:
+        tickers = tickers[:cfg.max_tickers]
+
+    bar = st.progress(0.0, text=f"📥 Téléchargement des prix de {len(tickers)} titres...")
+    prices, failed = download_prices(
+        tuple(tickers), buffer_start, cfg.end_date,
+        "float32" if cfg.low_precision else "float64",
+        0.0 if membership is not None else 0.6,
+        progress=lambda done, total: bar.progress(done / total,
+                                                  text=f"📥 Prix : {done}/{total} titres"),
+        local=cfg.local_only)
+    bar.empty()
+
+    if not prices.shape[1]:
+        st.error("Aucun prix disponible : décochez « Démarrer sur les prix déjà "
+                 "téléchargés » ou réessayez plus tard.")
+        st.stop()
+    if failed:
+        st.warning(f"⚠️ {len(failed)} titres non obtenus ({', '.join(failed[:10])}"
+                   f"{'...' if len(failed) > 10 else ''}) : backtest sur les titres "
+                   "disponibles, relancer pour compléter.")
+    st.success(f"✅ {prices.shape[1]} titres avec données exploitables.")
+    return prices, sectors, membership
+
+
+# ---------------------------------------------------------------
+# Métriques
+# ---------------------------------------------------------------
+def compute_metrics(rets, freq=252, n_boot=0):
+    """Métriques de performance standard.
+
+    Avec `n_boot` > 0, ajoute les intervalles de confiance à 95 % obtenus par
+    bootstrap en blocs (CAGR, Sharpe, Max Drawdown, Calmar).
+    """
+    stats, cum, dd = performance(rets, freq)
+    metrics = {
+        "CAGR": f"{stats['CAGR']:.2%}",
+        "Volatilité": f"{stats['Volatilité']:.2%}",
+        "Sharpe": f"{stats['Sharpe']:.2f}",
+        "Max Drawdown": f"{stats['Max Drawdown']:.2%}",
+        "Calmar": f"{stats['Calmar']:.2f}",
+        "Perf totale": f"{stats['Perf totale']:.2%}",
+    }
+    if n_boot:
+        formats = {"CAGR": ".2%", "Sharpe": ".2f", "Max Drawdown": ".2%", "Calmar": ".2f"}
+        for name, (low, high) in bootstrap(rets, n_boot, freq=freq).iterrows():
+            metrics[f"{name} (IC 95 %)"] = f"[{low:{formats[name]}} ; {high:{formats[name]}}]"
+    return metrics, cum, dd
+
+
+def rolling_engine(key, rets):
+    """Métriques glissantes de `rets` ; le moteur gardé en session ne traite
+    que les rendements ajoutés depuis le dernier affichage."""
+    engine = st.session_state.setdefault(key, RollingMetrics())
+    return engine.extend(rets)
+
+
+# ---------------------------------------------------------------
+# Modes
+# ---------------------------------------------------------------
+def _check_grid(grid):
+    if not all(grid.values()):
+        st.error("Choisissez au moins une valeur pour chaque paramètre.")
+        st.stop()
+
+
+def show_walk_forward(universe, cfg):
+    state_key = f"walk_forward|{universe.key}"
+    if cfg.run:
+        _check_grid(cfg.grid)
+        prices, _, membership = load_universe(universe, cfg, max(cfg.grid["lookback"]) + 2)
+        bench = download_benchmark(universe.benchmark, cfg.start_date, cfg.end_date)
+
+        bar = st.progress(0.0, text="⚙️ Walk-forward en cours...")
+        oos_rets, wf_windows = walk_forward(
+            prices, cfg.grid, cfg.start_date, cfg.train_months, cfg.test_months,
+            cfg.expanding, cfg.wf_metric, membership,
+            progress=lambda done, total: bar.progress(done / total,
+                                                      text=f"⚙️ {done}/{total} backtests"))
+        bar.empty()
+        st.session_state[state_key] = (oos_rets, wf_windows, bench)
+
+    if state_key not in st.session_state:
+        st.info("Choisissez une grille et des fenêtres puis lancez le walk-forward.")
+        st.stop()
+    oos_rets, wf_windows, bench = st.session_state[state_key]
+    if oos_rets is None:
+        st.error("Aucune fenêtre exploitable : élargissez la période "
+                 "ou raccourcissez la fenêtre d'apprentissage.")
+        st.stop()
+
+    st.header("🔁 Walk-forward (hors échantillon)")
+    bench_rets = bench.pct_change().dropna()
+    common_idx = oos_rets.index.intersection(bench_rets.index)
+    metrics_oos, cum_oos, _ = compute_metrics(oos_rets.loc[common_idx], n_boot=cfg.n_boot)
+    metrics_bench, cum_bench, _ = compute_metrics(bench_rets.loc[common_idx], n_boot=cfg.n_boot)
+    st.dataframe(pd.DataFrame({"Momentum (hors échantillon)": metrics_oos,
+                               f"{universe.benchmark} (Buy & Hold)": metrics_bench}),
+                 use_container_width=True)
+
+    fig_wf = go.Figure()
+    fig_wf.add_trace(go.Scatter(x=cum_oos.index, y=cum_oos,
+                                name="Momentum hors échantillon", line=dict(width=2)))
+    fig_wf.add_trace(go.Scatter(x=cum_bench.index, y=cum_bench,
+                                name=universe.benchmark, line=dict(width=2, dash="dash")))
+    fig_wf.update_layout(title="Performance cumulée hors échantillon (base 1)",
+                         yaxis_type="log", height=500,
+                         legend=dict(orientation="h", y=1.05))
+    st.plotly_chart(fig_wf, use_container_width=True)
+
+    st.subheader("Paramètres retenus par fenêtre")
+    st.dataframe(
+        wf_windows.style.format({c: "{:.2f}" for c in wf_windows.columns if "Sharpe" in c or "Calmar" in c}
+                                | {c: "{:.2%}" for c in wf_windows.columns
+                                   if "CAGR" in c or "Drawdown" in c}),
+        use_container_width=True, hide_index=True)
+
+
+def show_sweep(universe, cfg):
+    state_key = f"balayage|{universe.key}"
+    if cfg.run:
+        _check_grid(cfg.grid)
+        prices, _, membership = load_universe(universe, cfg, max(cfg.grid["lookback"]) + 2)
+
+        bar = st.progress(0.0, text="⚙️ Balayage en cours...")
+        st.session_state[state_key] = run_sweep(
+            prices, cfg.grid, start=cfg.start_date, universe=membership,
+            progress=lambda done, total: bar.progress(done / total,
+                                                      text=f"⚙️ {done}/{total} backtests"))
+        bar.empty()
+
+    if state_key not in st.session_state:
+        st.info("Choisissez une grille puis lancez le balayage.")
+        st.stop()
+    results = st.session_state[state_key]
+
+    st.header("🧪 Balayage de paramètres")
+    st.caption(f"{len(results)} combinaisons évaluées.")
+    st.dataframe(
+        results.style.format({"CAGR": "{:.2%}", "Volatilité": "{:.2%}", "Sharpe": "{:.2f}",
+                              "Max Drawdown": "{:.2%}", "Calmar": "{:.2f}",
+                              "Perf totale": "{:.2%}", "Turnover": "{:.1%}"}),
+        use_container_width=True, hide_index=True)
+
+    params = [c for c in results.columns if c not in METRICS + ["Turnover"]]
+    col_x, col_y = st.columns(2)
+    x = col_x.selectbox("Axe horizontal", params, index=params.index("n_stocks"))
+    y = col_y.selectbox("Axe vertical", params, index=params.index("lookback"))
+    if x == y:
+        st.warning("Choisissez deux paramètres différents.")
+        st.stop()
+    st.caption("Chaque case est la moyenne sur les autres paramètres balayés.")
+
+    for col, metric, fmt in zip(st.columns(3), ["Sharpe", "CAGR", "Max Drawdown"],
+                                [".2f", ".1%", ".1%"]):
+        table = heatmap_table(results, metric, x, y)
+        fig_hm = go.Figure(go.Heatmap(
+            z=table.values, x=[str(v) for v in table.columns],
+            y=[str(v) for v in table.index], colorscale="RdYlGn",
+            texttemplate=f"%{{z:{fmt}}}", colorbar=dict(tickformat=fmt)))
+        fig_hm.update_layout(title=metric, xaxis_title=x, yaxis_title=y, height=400)
+        col.plotly_chart(fig_hm, use_container_width=True)
+
+
+def show_backtest(universe, cfg):
+    bench_name = universe.benchmark
+    prices, sectors, membership = load_universe(universe, cfg, cfg.lookback + 2)
+    bench = download_benchmark(bench_name, cfg.start_date, cfg.end_date)
+
+    with st.spinner("⚙️ Backtest en cours..."):
+        strat_rets, weights_hist, avg_turnover = run_backtest_incremental(
+            prices, cfg.lookback, cfg.skip, cfg.n_stocks, cfg.rebal_freq,
+            cfg.weighting, cfg.cost_bps, membership)
+
+    if strat_rets is None:
+        st.error("Pas assez de données pour ces paramètres. "
+                 "Élargissez la période ou réduisez le lookback.")
+        st.stop()
+
+    # Aligner sur la période demandée
+    strat_rets = strat_rets.loc[str(cfg.start_date):]
+    bench_rets = bench.pct_change().dropna()
+    common_idx = strat_rets.index.intersection(bench_rets.index)
+    strat_rets, bench_rets = strat_rets.loc[common_idx], bench_rets.loc[common_idx]
+
+    metrics_strat, cum_strat, dd_strat = compute_metrics(strat_rets, n_boot=cfg.n_boot)
+    metrics_bench, cum_bench, dd_bench = compute_metrics(bench_rets, n_boot=cfg.n_boot)
+
+    # -----------------------------------------------------------
+    # Affichage des résultats
+    # -----------------------------------------------------------
+    st.header("📊 Résultats")
+
+    for col, (name, val) in zip(st.columns(6), metrics_strat.items()):
+        col.metric(f"{name} (Stratégie)", val, delta=None)
+    st.caption(f"Turnover moyen par rebalancement : {avg_turnover:.1%}")
+
+    # --- Tableau comparatif ---
+    comp = pd.DataFrame({"Momentum": metrics_strat, f"{bench_name} (Buy & Hold)": metrics_bench})
+    st.dataframe(comp, use_container_width=True)
+
+    # --- Courbe de performance ---
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=cum_strat.index, y=cum_strat,
+                             name="Stratégie Momentum", line=dict(width=2)))
+    fig.add_trace(go.Scatter(x=cum_bench.index, y=cum_bench,
+                             name=bench_name, line=dict(width=2, dash="dash")))
+    fig.update_layout(title="Performance cumulée (base 1)",
+                      yaxis_type="log", height=500,
+                      legend=dict(orientation="h", y=1.05))
+    st.plotly_chart(fig, use_container_width=True)
+
+    # --- Drawdown ---
+    fig_dd = go.Figure()
+    fig_dd.add_trace(go.Scatter(x=dd_strat.index, y=dd_strat, fill="tozeroy",
+                                name="Momentum"))
+    fig_dd.add_trace(go.Scatter(x=dd_bench.index, y=dd_bench,
+                                name=bench_name, line=dict(dash="dash")))
+    fig_dd.update_layout(title="Drawdown", yaxis_tickformat=".0%", height=350)
+    st.plotly_chart(fig_dd, use_container_width=True)
+
+    # --- Métriques glissantes ---
+    rolling_strat = rolling_engine(
+        f"glissant|{universe.key}|{cfg.max_tickers}|{cfg.point_in_time}|{cfg.start_date}|"
+        f"{cfg.lookback}|{cfg.skip}|{cfg.n_stocks}|{cfg.rebal_freq}|{cfg.weighting}|"
+        f"{cfg.cost_bps}", strat_rets)
+    rolling_bench = rolling_engine(f"glissant|{bench_name}|{cfg.start_date}", bench_rets)
+    st.subheader("Métriques glissantes")
+    for tab, metric in zip(st.tabs(ROLLING_METRICS), ROLLING_METRICS):
+        strat_frame, bench_frame = rolling_strat.frame(metric), rolling_bench.frame(metric)
+        fig_roll = go.Figure()
+        for window in strat_frame.columns:
+            fig_roll.add_trace(go.Scatter(x=strat_frame.index, y=strat_frame[window],
+                                          name=f"Momentum {window}"))
+            fig_roll.add_trace(go.Scatter(x=bench_frame.index, y=bench_frame[window],
+                                          name=f"{bench_name} {window}", line=dict(dash="dash")))
+        fig_roll.update_layout(title=f"{metric} glissant", height=350,
+                               yaxis_tickformat=".2f" if metric == "Sharpe" else ".0%")
+        tab.plotly_chart(fig_roll, use_container_width=True)
+
+    # --- Rendements annuels ---
+    yearly_strat = (1 + strat_rets).resample("YE").prod() - 1
+    yearly_bench = (1 + bench_rets).resample("YE").prod() - 1
+    yearly = pd.DataFrame({
+        "Momentum": yearly_strat.values,
+        bench_name: yearly_bench.reindex(yearly_strat.index).values
+    }, index=yearly_strat.index.year)
+    fig_yr = go.Figure()
+    fig_yr.add_trace(go.Bar(x=yearly.index, y=yearly["Momentum"], name="Momentum"))
+    fig_yr.add_trace(go.Bar(x=yearly.index, y=yearly[bench_name], name=bench_name))
+    fig_yr.update_layout(title="Rendements annuels", yaxis_tickformat=".0%",
+                         barmode="group", height=350)
+    st.plotly_chart(fig_yr, use_container_width=True)
+
+    # --- Portefeuille actuel ---
+    st.header("🗂️ Dernier portefeuille sélectionné")
+    last_date = max(weights_hist.keys())
+    last_w = weights_hist[last_date].sort_values(ascending=False)
+    df_port = pd.DataFrame({
+        "Ticker": last_w.index,
+        "Poids": last_w.values,
+        "Secteur": [sectors.get(t, "N/A") for t in last_w.index],
+    })
+    st.caption(f"Rebalancement du {last_date.date()}")
+
+    c1, c2 = st.columns([1, 1])
+    with c1:
+        st.dataframe(df_port.style.format({"Poids": "{:.2%}"}),
+                     use_container_width=True, height=400)
+    with c2:
+        sector_w = df_port.groupby("Secteur")["Poids"].sum().sort_values()
+        fig_sec = go.Figure(go.Bar(x=sector_w.values, y=sector_w.index,
+                                   orientation="h"))
+        fig_sec.update_layout(title="Exposition sectorielle",
+                              xaxis_tickformat=".0%", height=400)
+        st.plotly_chart(fig_sec, use_container_width=True)
+
+    # --- Export ---
+    st.download_button(
+        "💾 Télécharger les rendements quotidiens (CSV)",
+        strat_rets.to_csv().encode(),
+        file_name="momentum_returns.csv",
+        mime="text/csv",
+    )
+
+
+# ---------------------------------------------------------------
+# Page
+# ---------------------------------------------------------------
+def render(universe):
+    """Page complète (paramètres, backtest, résultats) pour `universe`."""
+    st.set_page_config(page_title=f"Momentum {universe.name}", layout="wide", page_icon="📈")
+    st.title(f"📈 Backtest Stratégie Momentum — {universe.name}")
+    st.caption(universe.caption)
+
+    cfg = _sidebar(universe)
+    if cfg.walk_mode:
+        show_walk_forward(universe, cfg)
+    elif cfg.sweep_mode:
+        show_sweep(universe, cfg)
+    elif cfg.run:
+        show_backtest(universe, cfg)
+    else:
+        st.info("👈 Configurez les paramètres dans la barre latérale puis "
+                "cliquez sur **Lancer le backtest**.")
@@ -0,0 +1,78 @@
+"""
+price_matrix.py — Matrice de prix compacte pour les grands univers.
+
+Un DataFrame pandas de 503 tickers × 10 ans en float64, puis ses copies
+successives (ffill, pct_change, resample, .loc), pèse vite plusieurs fois la
+taille des données. PriceMatrix garde :
+- un tableau NumPy contigu (dates × tickers), en float32 si demandé ;
+- un calendrier entier (jours depuis l'epoch, int32) trié ;
+- une table ticker -> numéro de colonne.
+
+Les vues par colonne et par plage de dates sont des vues NumPy (aucune copie),
+de même que to_frame() ; le moteur de backtest travaille ensuite dans le type
+des prix (pas de copie float64 de la matrice).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class PriceMatrix:
+    def __init__(self, values, days, tickers):
+        self.values = values
+        self.days = days
+        self.tickers = list(tickers)
+        self.column_of = {t: j for j, t in enumerate(self.tickers)}
+
+    @classmethod
+    def from_frame(cls, frame, dtype=None):
+        """Construit la matrice depuis un DataFrame dates × tickers (sans copie si possible)."""
+        values = frame.to_numpy(dtype=dtype, copy=False)
+        if not values.flags.c_contiguous:
+            values = np.ascontiguousarray(values)
+        days = pd.DatetimeIndex(frame.index).values.astype("datetime64[D]").astype("int32")
+        return cls(values, days, frame.columns)
+
+    # --- Dimensions ------------------------------------------------------
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.days.nbytes
+
+    @property
+    def dates(self):
+        return pd.DatetimeIndex(self.days.astype("datetime64[D]").astype("datetime64[ns]"), name="Date")
+
+    # --- Calendrier ------------------------------------------------------
+    @staticmethod
+    def day_of(date):
+        """Numéro de jour (depuis l'epoch) d'une date."""
+        return int(np.datetime64(pd.Timestamp(date).date(), "D").astype("int64"))
+
+    def row_of(self, date, side="left"):
+        """Position de `date` dans le calendrier (comme np.searchsorted)."""
+        return int(np.searchsorted(self.days, self.day_of(date), side=side))
+
+    # --- Vues sans copie -------------------------------------------------
+    def column(self, ticker):
+        """Série de prix d'un ticker (vue sur la matrice)."""
+        return self.values[:, self.column_of[ticker]]
+
+    def between(self, start=None, end=None):
+        """Sous-matrice des dates comprises entre `start` et `end` incluses (vue)."""
+        i0 = self.row_of(start) if start is not None else 0
+        i1 = self.row_of(end, side="right") if end is not None else len(self.days)
+        return PriceMatrix(self.values[i0:i1], self.days[i0:i1], self.tickers)
+
+    def select(self, tickers):
+        """Sous-matrice limitée à certains tickers (copie des colonnes choisies)."""
+        cols = [self.column_of[t] for t in tickers]
+        return PriceMatrix(self.values[:, cols], self.days, tickers)
+
+    # --- Conversion ------------------------------------------------------
+    def to_frame(self):
+        """DataFrame pandas partageant la mémoire de la matrice."""
+        return pd.DataFrame(self.values, index=self.dates, columns=self.tickers, copy=False)
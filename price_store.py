@@ -0,0 +1,275 @@
+"""
+price_store.py — Stockage local des historiques OHLCV quotidiens.
+
+Un fichier Parquet par ticker dans STORE_DIR. Le fichier conserve l'historique
+le plus long jamais téléchargé ; au rechargement on ne demande au fournisseur
+(market_data.get_provider()) que les barres postérieures à la dernière date
+stockée, puis toute période (2y, 5y ou plage de dates libre) est servie par
+simple découpage local.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from fetch_pool import get_pool
+from market_data import OHLCV_COLUMNS, get_provider, period_start
+from singleflight import group
+
+STORE_DIR = os.environ.get("INDEX_SUIVI_STORE", os.path.join("data", "prices"))
+
+# Délai (secondes) au-delà duquel on redemande les dernières barres au fournisseur
+REFRESH_SECONDS = 3600
+
+# Les compléments repartent OVERLAP_DAYS jours avant la dernière barre stockée :
+# les barres complètes communes servent à détecter un réajustement de
+# l'historique (split, dividende), au-delà d'un écart relatif ADJUSTMENT_TOLERANCE
+OVERLAP_DAYS = 7
+ADJUSTMENT_TOLERANCE = 1e-4
+
+_META_KEY = b"index_suivi"
+
+# Requêtes identiques concurrentes (plusieurs sessions) : un seul téléchargement
+_flight = group("prix", ttl=5)
+
+
+# ---------------------------------------------------------------
+# Lecture / écriture des partitions
+# ---------------------------------------------------------------
+def _path(ticker):
+    return os.path.join(STORE_DIR, f"{ticker.replace('/', '_')}.parquet")
+
+
+def read_file(path):
+    """Lit un fichier Parquet du stockage. Retourne (DataFrame, métadonnées) ou (None, {})."""
+    if not os.path.exists(path):
+        return None, {}
+    table = pq.read_table(path)
+    meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+    return table.to_pandas(), meta
+
+
+def write_file(path, data, meta):
+    """Écrit un fichier Parquet de façon atomique (fichier temporaire puis renommage)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(data)
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[_META_KEY] = json.dumps(meta).encode()
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table.replace_schema_metadata(schema_meta), tmp)
+    os.replace(tmp, path)
+
+
+def read(ticker):
+    """Lit la partition d'un ticker. Retourne (DataFrame, métadonnées) ou (None, {})."""
+    return read_file(_path(ticker))
+
+
+def write(ticker, data, meta):
+    """Écrit la partition d'un ticker."""
+    write_file(_path(ticker), data, meta)
+
+
+def _merge(stored, new):
+    """Fusionne deux historiques, les barres récentes remplaçant les anciennes."""
+    if stored is None or stored.empty:
+        return new
+    if new is None or new.empty:
+        return stored
+    merged = pd.concat([stored, new])
+    return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+
+# ---------------------------------------------------------------
+# Mise à jour depuis le fournisseur
+# ---------------------------------------------------------------
+def _batchable(ticker):
+    """Les contrats à terme (GC=F) et paires de devises (EURUSD=X) ne passent pas
+    correctement dans une requête groupée avec des actions."""
+    return "=" not in ticker
+
+
+def _fetch(tickers, errors=None, **kwargs):
+    """Télécharge des tickers : requête groupée quand c'est possible, sinon (ou
+    pour les tickers que le groupe n'a pas renvoyés) pool concurrent ticker par ticker.
+
+    Les échecs individuels sont consignés dans `errors` sans interrompre les autres.
+    Si la requête groupée est refusée pour limitation de débit, ses tickers ne
+    sont pas redemandés un par un (ce qui multiplierait les requêtes refusées) :
+    ils sont consignés en échec avec l'erreur du groupe.
+    """
+    provider = get_provider()
+    pool = get_pool()
+    batch = [t for t in tickers if _batchable(t)]
+    single = [t for t in tickers if not _batchable(t)]
+    frames, failures, batch_error = {}, {}, None
+    if len(batch) > 1:
+        try:
+            frames.update(provider.history(batch, **kwargs))
+        except Exception as exc:
+            batch_error = exc
+        if batch_error is not None and pool.retry_on(batch_error):
+            failures.update(dict.fromkeys(batch, batch_error))
+        else:
+            single += [t for t in batch if t not in frames]
+    else:
+        single += batch
+
+    results, single_failures = pool.map(lambda t: provider.history([t], **kwargs), single)
+    for ticker, result in results.items():
+        if ticker in result:
+            frames[ticker] = result[ticker]
+    failures.update(single_failures)
+    if batch_error is not None:
+        # Tickers du groupe toujours sans données : l'erreur du groupe reste la cause connue
+        failures.update((t, batch_error) for t in batch if t not in frames and t not in failures)
+    if errors is not None:
+        errors.update(failures)
+    return frames
+
+
+def _readjusted(stored, new):
+    """Vrai si le fournisseur a réajusté l'historique depuis son stockage : la
+    clôture de la première barre complète commune a changé (les prix étant
+    ajustés, un split ou un dividende modifie toutes les barres antérieures)."""
+    common = stored.index[:-1].intersection(new.index)
+    if common.empty:
+        return False
+    old, fresh = stored.at[common[0], "Close"], new.at[common[0], "Close"]
+    return bool(abs(fresh - old) > ADJUSTMENT_TOLERANCE * abs(old))
+
+
+def _needs_full(stored, meta, requested):
+    """Vrai si la partition est absente ou ne remonte pas jusqu'à la date demandée."""
+    covered = meta.get("covered_from", "")
+    return stored is None or bool(covered and (not requested or requested < covered))
+
+
+def ensure_many(tickers, start=None, errors=None):
+    """Garantit que les partitions couvrent `start` et sont à jour, puis les retourne.
+
+    - Rien en stock, ou demande plus ancienne que la couverture : téléchargement
+      complet depuis `start` (fusionné avec l'existant).
+    - Sinon, si la partition est périmée : seules les barres à partir de
+      quelques jours avant la dernière date stockée sont demandées (la dernière
+      barre, éventuellement intrajournalière, est ainsi corrigée). Si les
+      barres communes ne concordent pas (historique réajusté après un split
+      ou un dividende), toute la période couverte est retéléchargée et
+      remplace la partition.
+
+    Chaque groupe (complet, ou compléments de même dernière date stockée)
+    part en une seule requête groupée (voir _fetch). Retourne un dict ticker -> DataFrame pour les tickers
+    disposant de données ; les échecs sont consignés dans `errors`.
+    """
+    now = time.time()
+    requested = start.strftime("%Y-%m-%d") if start is not None else ""
+    stored, metas = {}, {}
+    for ticker in dict.fromkeys(tickers):
+        stored[ticker], metas[ticker] = read(ticker)
+
+    full = [t for t in stored if _needs_full(stored[t], metas[t], requested)]
+    stale = [t for t in stored if t not in full
+             and now - metas[t].get("updated", 0) > REFRESH_SECONDS]
+
+    if full:
+        new = _fetch(full, errors, start=start, period="max" if start is None else None)
+        for ticker in full:
+            if ticker not in new:
+                continue
+            stored[ticker] = _merge(stored[ticker], new[ticker])
+            metas[ticker] = {"covered_from": requested, "updated": now}
+            write(ticker, stored[ticker], metas[ticker])
+
+    # Compléments groupés par dernière date stockée : un ticker en retard (par
+    # exemple sorti de l'indice) ne fait pas retélécharger des années de barres
+    # aux autres. En cas d'échec du fournisseur, on sert l'historique local.
+    resume = {t: stored[t].index.max() - pd.Timedelta(days=OVERLAP_DAYS)
+              if not stored[t].empty else start for t in stale}
+    readjusted = []
+    for first in dict.fromkeys(resume.values()):
+        group = [t for t in stale if resume[t] == first]
+        new = _fetch(group, start=first)
+        for ticker in group:
+            if ticker not in new:
+                continue
+            if _readjusted(stored[ticker], new[ticker]):
+                readjusted.append(ticker)
+                continue
+            stored[ticker] = _merge(stored[ticker], new[ticker])
+            metas[ticker]["updated"] = now
+            write(ticker, stored[ticker], metas[ticker])
+
+    # Historique réajusté : la partition est remplacée (pas de fusion), par
+    # groupe de couverture ; en cas d'échec, nouvel essai au prochain appel
+    for covered in dict.fromkeys(metas[t].get("covered_from", "") for t in readjusted):
+        group = [t for t in readjusted if metas[t].get("covered_from", "") == covered]
+        since = pd.Timestamp(covered) if covered else None
+        new = _fetch(group, errors, start=since, period="max" if since is None else None)
+        for ticker in group:
+            if ticker not in new:
+                continue
+            stored[ticker] = new[ticker]
+            metas[ticker] = {"covered_from": covered, "updated": now}
+            write(ticker, stored[ticker], metas[ticker])
+
+    return {t: data for t, data in stored.items() if data is not None}
+
+
+def slice_dates(data, start=None, end=None):
+    """Découpe un historique entre deux dates (bornes incluses)."""
+    if start is not None:
+        data = data.loc[start:]
+    if end is not None:
+        data = data.loc[:pd.Timestamp(end)]
+    return data
+
+
+def get_stored(tickers, start=None, end=None):
+    """Historiques déjà présents dans le stockage local, sans aucune requête au
+    fournisseur : dict ticker -> DataFrame (tickers absents du stockage omis)."""
+    data = {}
+    for ticker in dict.fromkeys(t for t in tickers if t):
+        stored, _ = read(ticker)
+        if stored is not None:
+            data[ticker] = slice_dates(stored, start, end)
+    return data
+
+
+def get_history(ticker, period=None, start=None, end=None):
+    """Retourne l'historique OHLCV d'un ticker pour une période ou une plage de dates.
+
+    `period` suit la convention yfinance ('2y', '5y'...) ; `start`/`end` permettent
+    une plage libre. Les données sont servies depuis le stockage local.
+    """
+    errors = {}
+    data = get_many([ticker], period, start, end, errors=errors)
+    if ticker in errors:
+        raise errors[ticker]
+    return data.get(ticker, pd.DataFrame(columns=OHLCV_COLUMNS))
+
+
+def get_many(tickers, period=None, start=None, end=None, errors=None):
+    """Version groupée de get_history : dict ticker -> DataFrame.
+
+    Les tickers à télécharger partent en une seule requête au fournisseur au lieu
+    d'un aller-retour par ticker. Les échecs individuels (résultats partiels)
+    sont consignés dans `errors` si un dict est fourni. Les appels identiques
+    concurrents partagent un seul téléchargement (singleflight).
+    """
+    start = pd.Timestamp(start) if start is not None else period_start(period)
+    tickers = tuple(t for t in tickers if t)
+
+    def load():
+        failures = {}
+        data = ensure_many(tickers, start, failures)
+        return {t: slice_dates(frame, start, end) for t, frame in data.items()}, failures
+
+    data, failures = _flight.do((tickers, start, end), load)
+    if errors is not None:
+        errors.update(failures)
+    return data
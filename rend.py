@@ -1,42 +1,153 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
 import streamlit as st
-from dividend import get_dividends  # Assurez-vous que get_dividends est défini dans dividend.py
+from dividend import get_dividends, get_trailing_dividends
+from differential import close_matrix
+import price_store
+import dividend_ledger
 from datetime import datetime
 
-# Charger les valeurs d'action depuis le fichier
-def load_action_values(file_path="action_values.txt"):
-    action_values = {}
-    try:
-        with open(file_path, "r") as file:
-            for line in file:
-                if ":" in line:
-                    ticker, value = line.strip().split(":")
-                    action_values[ticker] = float(value)  # Convertir en float pour les calculs
-    except FileNotFoundError:
-        print("Erreur : Le fichier action_values.txt est introuvable.")
-    
-    return action_values
-
-# Récupérer les dividendes et les valeurs d'action
-all_dividends = get_dividends()
-action_values = load_action_values("action_values.txt")
-
-# Définir l'année de référence dynamique (N-1)
-reference_year = str(datetime.now().year - 1)
-
-# Nouveau dictionnaire pour stocker les résultats
-dividendes_ratio = {}
-
-# Calculer le ratio dividende / valeur d'action pour chaque ticker
-for ticker, dividends_df in all_dividends.items():
-    if not dividends_df.empty and ticker in action_values:
-        # Filtrer pour obtenir uniquement l'année de référence N-1
-        dividendes_n_1 = dividends_df[dividends_df['Year'] == reference_year]
-        
-        if not dividendes_n_1.empty:
-            dividende_value = dividendes_n_1[ticker].values[0]  # Extraire le dividende de l'année N-1
-            action_value = action_values[ticker]  # Récupérer la valeur de l'action
-            ratio = (dividende_value / action_value) * 100  # Calculer le ratio en pourcentage
-            dividendes_ratio[ticker] = round(ratio, 2)  # Arrondir à deux décimales pour plus de lisibilité
-
-# Afficher les résultats dans Streamlit
-#st.write(f"Ratio Dividende {reference_year} / Valeur de l'Action pour chaque Ticker (en %):", dividendes_ratio)
+# Délai (secondes) au-delà duquel les rendements sont recalculés en arrière-plan,
+# aligné sur le rafraîchissement des cours du stockage local
+REFRESH_SECONDS = price_store.REFRESH_SECONDS
+
+# Après un échec, nouvel essai au bout de RETRY_SECONDS, délai doublé à chaque
+# échec consécutif (plafonné à REFRESH_SECONDS)
+RETRY_SECONDS = 60
+
+# Clôtures non ajustées des dividendes. Les cours stockés sont ajustés
+# (auto_adjust) : Yahoo multiplie chaque clôture antérieure à un détachement D
+# par 1 - D / P, P étant la clôture brute de la veille. En remontant les
+# détachements du plus récent au plus ancien, le facteur cumulé C des
+# détachements postérieurs devient, la veille d'un détachement,
+# C / (1 + D·C / clôture ajustée de la veille).
+# `payments` : dict ticker -> Series des versements indexée par date.
+def unadjusted_closes(closes, payments):
+    raw = closes.copy()
+    for ticker, paid in payments.items():
+        if ticker not in raw.columns or paid.empty:
+            continue
+        adjusted = raw[ticker].to_numpy(dtype="float64")
+        factor = np.ones(len(adjusted))
+        cumulative = 1.0
+        # Un détachement postérieur à la dernière clôture n'est pas encore répercuté
+        for date, amount in paid[paid.index <= raw.index[-1]].sort_index(ascending=False).items():
+            before = raw.index.searchsorted(date) - 1
+            if before < 0 or np.isnan(adjusted[before]):
+                break
+            cumulative /= 1 + amount * cumulative / adjusted[before]
+            factor[:before + 1] = cumulative
+        raw[ticker] = adjusted / factor
+    return raw
+
+
+# Rendements de toute la liste en une seule jointure vectorisée entre la
+# matrice des dividendes (années × tickers) et celle des clôtures (dates × tickers).
+# Retourne un DataFrame tickers × ['12 mois', '2023', '2024', ...] en % :
+# - '12 mois' : dividendes des 12 derniers mois / dernière clôture ;
+# - année N   : dividendes de l'année N / dernière clôture de l'année N
+#               (dernière clôture disponible pour l'année en cours).
+def compute_yields():
+    all_dividends = get_dividends()
+    tickers = list(all_dividends.columns)
+    if all_dividends.empty or not tickers:
+        return pd.DataFrame()
+
+    # Clôtures depuis le stockage local (complété de façon incrémentale)
+    first_year = all_dividends.index.min()
+    closes = close_matrix(price_store.get_many(tickers, start=f"{first_year}-01-01"))
+    if closes.empty:
+        return pd.DataFrame()
+    closes = closes.ffill()
+
+    # Dénominateurs des années passées : clôtures réellement cotées, pas les
+    # clôtures ajustées des dividendes versés depuis (qui sous-estiment le cours)
+    raw = unadjusted_closes(closes, {t: dividend_ledger.payments(t) for t in tickers})
+    year_end = raw.resample("YE").last()
+    year_end.index = year_end.index.year.astype(str)
+    yearly = all_dividends / year_end.reindex(all_dividends.index) * 100
+
+    trailing = get_trailing_dividends(tickers) / closes.iloc[-1] * 100
+
+    yields = yearly.T
+    yields.insert(0, "12 mois", trailing)
+    return yields.dropna(how="all").round(2)
+
+
+# Titre "Rendement" d'un graphique à partir de la table des rendements
+def titre_rendement(yields, ticker):
+    if ticker not in yields.index:
+        return ""
+    row = yields.loc[ticker]
+    reference_year = str(datetime.now().year - 1)
+    parts = []
+    if pd.notna(row.get("12 mois")):
+        parts.append(f"{row['12 mois']} % sur 12 mois")
+    if pd.notna(row.get(reference_year)):
+        parts.append(f"{row[reference_year]} % en {reference_year}")
+    return f"Rendement : {' · '.join(parts)}" if parts else ""
+
+
+# Service de rendement : le calcul (dividendes et cours de toute la liste)
+# tourne en arrière-plan au lieu de bloquer l'import du module et le
+# premier affichage. Les pages lisent le dernier résultat disponible.
+class YieldService:
+    def __init__(self, refresh_seconds=REFRESH_SECONDS, retry_seconds=RETRY_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.error = None
+        self._yields = None
+        self._updated = 0.0
+        self._failures = 0
+        self._failed_at = 0.0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            yields = compute_yields()
+            with self._lock:
+                self._yields = yields
+                self._updated = time.time()
+                self._failures = 0
+                self.error = None
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+                self._failed_at = time.time()
+                self.error = e
+
+    def _due(self, now):
+        """Vrai si un calcul doit être lancé : résultat périmé, et délai
+        d'attente écoulé depuis le dernier échec."""
+        if now - self._updated <= self.refresh_seconds:
+            return False
+        if not self._failures:
+            return True
+        delay = min(self.retry_seconds * 2 ** (self._failures - 1), self.refresh_seconds)
+        return now - self._failed_at > delay
+
+    def ready(self):
+        """Vrai si des rendements sont disponibles (voir `error` pour le dernier échec)."""
+        return self._yields is not None
+
+    def yields(self):
+        """Derniers rendements calculés (vide tant que le premier calcul n'est pas fini).
+
+        Relance un calcul en arrière-plan si le résultat est périmé : dividendes
+        et cours étant stockés localement, seul le complément est téléchargé.
+        Après un échec, les essais sont espacés (back-off exponentiel).
+        """
+        with self._lock:
+            if self._due(time.time()) and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._refresh, daemon=True)
+                self._thread.start()
+            return self._yields if self._yields is not None else pd.DataFrame()
+
+
+# Un seul service par processus, partagé par toutes les sessions
+@st.cache_resource
+def get_yield_service():
+    return YieldService()
@@ -0,0 +1,99 @@
+"""
+rolling.py — Métriques glissantes (Sharpe, volatilité, drawdown) sur plusieurs fenêtres.
+
+Un seul passage en O(n) par fenêtre, sans pandas.rolling :
+- moyenne et variance par différences de sommes cumulées ;
+- plus haut glissant (pour le drawdown) par l'algorithme de van Herk /
+  Gil-Werman : maxima cumulés par blocs de la taille de la fenêtre, de gauche
+  à droite et de droite à gauche.
+
+RollingMetrics garde les rendements déjà traités : extend() ne calcule que
+les nouvelles lignes, à partir des window - 1 derniers rendements connus.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Fenêtres par défaut (jours de bourse) et leur libellé
+WINDOWS = {63: "3 mois", 126: "6 mois", 252: "12 mois"}
+METRICS = ["Sharpe", "Volatilité", "Drawdown"]
+
+
+def _sliding_max(values, window):
+    """Plus haut de chaque fenêtre complète : tableau de len(values) - window + 1 valeurs."""
+    size = len(values)
+    padded = np.full(-(-size // window) * window, -np.inf)
+    padded[:size] = values
+    blocks = padded.reshape(-1, window)
+    left = np.maximum.accumulate(blocks, axis=1).ravel()
+    right = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    end = np.arange(window - 1, size)
+    return np.maximum(right[end - window + 1], left[end])
+
+
+def _window_metrics(rets, window, freq):
+    """Sharpe, volatilité et drawdown glissants pour chaque fenêtre complète de `rets`."""
+    sums = np.concatenate([[0.0], np.cumsum(rets)])
+    squares = np.concatenate([[0.0], np.cumsum(rets ** 2)])
+    total = sums[window:] - sums[:-window]
+    mean = total / window
+    var = np.maximum(squares[window:] - squares[:-window] - total * mean, 0) / (window - 1)
+    vol = np.sqrt(var * freq)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, mean * freq / vol, np.nan)
+
+    # Drawdown par rapport au plus haut de la fenêtre (échelle logarithmique)
+    log_cum = np.cumsum(np.log1p(rets))
+    drawdown = np.expm1(log_cum[window - 1:] - _sliding_max(log_cum, window))
+    return {"Sharpe": sharpe, "Volatilité": vol, "Drawdown": drawdown}
+
+
+class RollingMetrics:
+    """Métriques glissantes d'une série de rendements quotidiens, complétée au fil de l'eau."""
+
+    def __init__(self, windows=WINDOWS, freq=252):
+        self.windows = dict(windows)
+        self.freq = freq
+        self.rets = np.empty(0)
+        self.dates = pd.DatetimeIndex([])
+        self._values = {(m, w): np.empty(0) for m in METRICS for w in self.windows}
+
+    def reset(self):
+        self.__init__(self.windows, self.freq)
+
+    def extend(self, rets):
+        """Ajoute les rendements postérieurs à la dernière date traitée.
+
+        Si la série ne prolonge pas celle déjà traitée (rendements passés
+        modifiés), tout est recalculé.
+        """
+        rets = rets.dropna()
+        if len(self.dates):
+            known = rets.index <= self.dates[-1]
+            if not (rets.index[known].equals(self.dates)
+                    and np.array_equal(rets.to_numpy()[known], self.rets)):
+                self.reset()
+            else:
+                rets = rets[~known]
+        if rets.empty:
+            return self
+
+        new = rets.to_numpy(dtype="float64")
+        old = len(self.rets)
+        for window in self.windows:
+            # Contexte : les window - 1 rendements précédents suffisent
+            context = np.concatenate([self.rets[max(old - window + 1, 0):], new])
+            computed = _window_metrics(context, window, self.freq) if len(context) >= window else {}
+            for metric in METRICS:
+                values = np.full(len(new), np.nan)
+                if metric in computed:
+                    values[len(new) - len(computed[metric]):] = computed[metric]
+                self._values[metric, window] = np.concatenate([self._values[metric, window], values])
+        self.rets = np.concatenate([self.rets, new])
+        self.dates = self.dates.append(rets.index)
+        return self
+
+    def frame(self, metric):
+        """DataFrame dates × fenêtres (libellés) de la métrique `metric`."""
+        return pd.DataFrame({label: self._values[metric, window]
+                             for window, label in self.windows.items()}, index=self.dates)
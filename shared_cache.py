@@ -0,0 +1,145 @@
+"""
+shared_cache.py — Cache de séries de prix partagé entre processus Streamlit.
+
+Derrière un répartiteur de charge, chaque processus gardait sa propre copie
+(st.cache_data) de tous les historiques. Ici chaque entrée est un fichier
+Arrow IPC non compressé dans CACHE_DIR, lu par projection mémoire (mmap) :
+les valeurs du DataFrame retourné pointent directement dans le fichier, et
+toutes les instances d'un même hôte partagent les mêmes pages du cache
+système. La mémoire croît donc avec le nombre de tickers distincts, pas avec
+tickers × processus.
+
+Les DataFrames retournés sont en lecture seule ; toute opération pandas
+produit une copie locale, comme d'habitude.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+CACHE_DIR = os.environ.get("INDEX_SUIVI_SHARED_CACHE", os.path.join("data", "shared"))
+
+# Les entrées plus anciennes sont supprimées lors des écritures
+KEEP_SECONDS = 7 * 86400
+
+_META_KEY = b"index_suivi"
+_local = {}
+_local_lock = threading.Lock()
+
+
+def fingerprint(frame):
+    """Empreinte du contenu d'un DataFrame numérique (index, colonnes, valeurs).
+
+    Les valeurs sont hachées dans leur type d'origine, directement depuis le
+    tampon NumPy (pas de copie float64 d'une matrice float32).
+    """
+    values = np.ascontiguousarray(frame.to_numpy())
+    digest = hashlib.sha1()
+    digest.update(pd.DatetimeIndex(frame.index).as_unit("ns").asi8.tobytes())
+    digest.update("\x1f".join(map(str, frame.columns)).encode())
+    digest.update(str(values.dtype).encode())
+    digest.update(values)
+    return digest.hexdigest()
+
+
+def _path(key):
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.arrow")
+
+
+def _to_table(frame):
+    """Matrice float32/float64 (dates × colonnes) stockée ligne par ligne dans une liste de taille fixe."""
+    dtype = "float32" if all(t == np.float32 for t in frame.dtypes) else "float64"
+    values = np.ascontiguousarray(frame.to_numpy(dtype=dtype))
+    n_cols = values.shape[1]
+    index = pd.DatetimeIndex(frame.index).as_unit("ns").asi8
+    table = pa.table({
+        "index": pa.array(index, type=pa.int64()),
+        "values": pa.FixedSizeListArray.from_arrays(
+            pa.array(values.ravel(), from_pandas=False), n_cols),
+    })
+    meta = {"columns": [str(c) for c in frame.columns], "created": time.time()}
+    return table.replace_schema_metadata({_META_KEY: json.dumps(meta).encode()})
+
+
+def _from_file(path):
+    """Reconstruit le DataFrame sans copie à partir du fichier projeté en mémoire."""
+    reader = pa.ipc.open_file(pa.memory_map(path))
+    table = reader.read_all()
+    meta = json.loads(table.schema.metadata[_META_KEY])
+    columns = meta["columns"]
+    index = pd.DatetimeIndex(
+        table.column("index").to_numpy().view("datetime64[ns]"), name="Date")
+    if len(index):
+        values = table.column("values").chunk(0).values.to_numpy(zero_copy_only=True)
+    else:
+        values = np.empty(0, dtype=table.schema.field("values").type.value_type.to_pandas_dtype())
+    values = values.reshape(len(index), len(columns))
+    return pd.DataFrame(values, index=index, columns=columns, copy=False), meta["created"]
+
+
+def get(key, max_age=None):
+    """Retourne l'entrée `key` si elle existe et a moins de `max_age` secondes, sinon None."""
+    path = _path(key)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if max_age is not None and time.time() - mtime > max_age:
+        return None
+    with _local_lock:
+        cached = _local.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        frame, _ = _from_file(path)
+    except (OSError, pa.ArrowInvalid):
+        # Fichier remplacé ou supprimé entre-temps par un autre processus
+        return None
+    with _local_lock:
+        _local[path] = (mtime, frame)
+    return frame
+
+
+def put(key, frame):
+    """Écrit `frame` (valeurs numériques) sous `key` et retourne sa version partagée."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _path(key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    table = _to_table(frame)
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    prune()
+    return get(key)
+
+
+def get_or_compute(key, compute, max_age=None):
+    """Lit `key` dans le cache partagé, ou calcule et publie l'entrée."""
+    frame = get(key, max_age)
+    if frame is None:
+        frame = put(key, compute())
+    return frame
+
+
+def prune(keep_seconds=KEEP_SECONDS):
+    """Supprime les entrées trop anciennes (les lecteurs en cours gardent leur projection)."""
+    now = time.time()
+    try:
+        entries = os.scandir(CACHE_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > keep_seconds:
+                    os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,96 @@
+"""
+singleflight.py — Regroupement des requêtes identiques concurrentes.
+
+À l'ouverture du marché, plusieurs sessions Streamlit ratent le cache pour la
+même clé (ticker, période) au même moment. Un groupe SingleFlight garantit
+qu'un seul téléchargement est en vol par clé : les appels concurrents
+attendent son résultat au lieu de lancer le leur.
+
+Compteurs exposés par stats() :
+- hits      : résultat servi depuis la mémoire récente (ttl) ;
+- misses    : appel effectivement exécuté ;
+- coalesced : appel rattaché à un téléchargement déjà en vol.
+"""
+
+import threading
+import time
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Un seul appel en vol par clé ; les résultats réussis sont gardés `ttl` secondes."""
+
+    def __init__(self, ttl=0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._recent = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Exécute `fn()` pour `key`, ou partage le résultat d'un appel identique."""
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is not None and time.monotonic() - recent[0] < self.ttl:
+                self.hits += 1
+                return recent[1]
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                if call.error is None and self.ttl:
+                    now = time.monotonic()
+                    self._recent = {k: v for k, v in self._recent.items() if now - v[0] < self.ttl}
+                    self._recent[key] = (now, call.value)
+            call.done.set()
+        return call.value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def group(name, ttl=0):
+    """Retourne le groupe `name` partagé par tout le processus (créé au besoin)."""
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(ttl)
+        return _groups[name]
+
+
+def stats():
+    """Compteurs de tous les groupes : dict nom -> stats."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: g.stats() for name, g in groups.items()}
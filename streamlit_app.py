@@ -1,21 +1,40 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import plotly.graph_objs as go
 from dividend import get_dividends  # Fonction pour obtenir les dividendes par ticker
-from rend import dividendes_ratio  # Importer le ratio dividendes/action
-
-# Fonction mise en cache pour télécharger les données de yfinance
-@st.cache_data
-def fetch_data(ticker, period):
-    try:
-        # Télécharger les données depuis yfinance
-        data = yf.download(ticker, period=period, auto_adjust =True)
-        data = data.xs(ticker, axis=1, level='Ticker')
+from rend import get_yield_service, titre_rendement  # Rendements (dividendes / cours), calculés en arrière-plan
+import price_store  # Stockage local des historiques (complété de façon incrémentale)
+import bars  # Barres hebdomadaires / mensuelles pré-agrégées
+from differential import close_matrix, ratio_matrix  # Ratios ticker / référence en bloc
+import singleflight  # Regroupement des téléchargements identiques entre sessions
+import shared_cache  # Cache des historiques partagé entre processus
+
+# Fonction pour récupérer plusieurs tickers en une seule requête groupée.
+# `timeframe` : 'D' (quotidien) ou barres pré-agrégées 'W' / 'ME' (voir bars.py).
+# Les historiques sont servis depuis le cache partagé entre processus (mmap)
+# plutôt que copiés dans le st.cache_data de chaque processus.
+def fetch_many(tickers, period, timeframe="D"):
+    data, missing = {}, []
+    for ticker in dict.fromkeys(t for t in tickers if t):
+        frame = shared_cache.get(("ohlcv", ticker, period, timeframe), max_age=price_store.REFRESH_SECONDS)
+        if frame is None:
+            missing.append(ticker)
+        else:
+            data[ticker] = frame
+    if not missing:
         return data
-    except Exception as e:
+
+    errors = {}
+    if timeframe == "D":
+        fresh = price_store.get_many(missing, period, errors=errors)
+    else:
+        fresh = bars.get_many(missing, timeframe, period, errors=errors)
+    for ticker, frame in fresh.items():
+        data[ticker] = shared_cache.put(("ohlcv", ticker, period, timeframe), frame)
+    # Résultats partiels : un ticker en échec n'empêche pas l'affichage des autres
+    for ticker, e in errors.items():
         st.error(f"Erreur lors de la récupération des données pour {ticker} : {e}")
-        return None
+    return data
 
 # Fonction pour charger la liste depuis un fichier
 def load_list(filename):
@@ -48,6 +67,17 @@ def display_candlestick(tickers, period, show_sma, sma_period, key_prefix):
     green_square_list = ['SP5.PA', 'UST.PA', 'MGT.PA', 'WLD.PA', 'JPNH.PA', 'SGQI.PA', 'CRP.PA', 'GC=F']
     red_square_list = ['FDJ.PA', 'ENGI.PA', 'ORA.PA', 'STLAP.PA', 'CS.PA', 'EN.PA', 'DG.PA', 'TTE.PA', 'GLE.PA', 'BNP.PA', 'TFI.PA','GTT.PA','NXI.PA']
 
+    # Rendements disponibles (calculés en arrière-plan, affichés dès qu'ils sont prêts)
+    yield_service = get_yield_service()
+    yields = yield_service.yields()
+    if yield_service.error is not None:
+        st.caption(f"⚠️ Calcul des rendements en échec ({yield_service.error}), nouvel essai automatique.")
+    elif not yield_service.ready():
+        st.caption("⏳ Rendements en cours de calcul, ils s'afficheront au prochain rafraîchissement.")
+
+    # Récupérer les barres hebdomadaires de tous les tickers de l'onglet en une seule requête
+    all_data = fetch_many(tuple(tickers), period, "W")
+
     for ticker in tickers:
         # Préfixe pour chaque ticker
         unique_key = f"{key_prefix}_{ticker}"
@@ -60,9 +90,6 @@ def display_candlestick(tickers, period, show_sma, sma_period, key_prefix):
         else:
             title_prefix = ""
 
-        # Récupérer le rendement pour le ticker, si disponible
-        yield_percentage = dividendes_ratio.get(ticker, None)  # None si le rendement est introuvable
-
         # Titre principal sans rendement
         st.subheader(f"{title_prefix}Cours de {ticker} - {period} d'historique")
 
@@ -73,17 +100,15 @@ def display_candlestick(tickers, period, show_sma, sma_period, key_prefix):
             # st.markdown(f"<span style='color:{color}; font-weight:bold;'>Rendement : {yield_percentage}%</span>", unsafe_allow_html=True)
             #st.subheader(f"Rendement : {yield_percentage} %")
         
-        title_rendement = f"Rendement : {yield_percentage} %" if yield_percentage is not None else ""
+        # Titre du rendement (12 mois glissants et année N-1), vide si introuvable
+        title_rendement = titre_rendement(yields, ticker)
         # Récupérer les données de cours pour le ticker
-        data = fetch_data(ticker, period)
+        data = all_data.get(ticker)
         
         if data is None or data.empty:
             st.warning(f"Aucune donnée trouvée pour {ticker}.")
             continue
 
-        # Resample les données hebdomadaires
-        data = data.resample('W').agg({'Close': 'last', 'Open': 'first', 'High': 'max', 'Low': 'min'})
-
         # Création du graphique en chandelier
         fig = go.Figure(data=[go.Candlestick(
             x=data.index,
@@ -96,10 +121,10 @@ def display_candlestick(tickers, period, show_sma, sma_period, key_prefix):
 
         # Ajouter la moyenne mobile simple si activée
         if show_sma:
-            data['SMA'] = data['Close'].rolling(window=sma_period).mean()
+            sma = data['Close'].rolling(window=sma_period).mean()
             fig.add_trace(go.Scatter(
                 x=data.index,
-                y=data['SMA'],
+                y=sma,
                 mode='lines',
                 name=f'SMA {sma_period} périodes',
                 line=dict(color='yellow', width=2)
@@ -133,6 +158,16 @@ def display_candlestick(tickers, period, show_sma, sma_period, key_prefix):
 
 # Fonction pour afficher les courbes différentielles
 def display_differential_curves(tickers, ref_ticker, period, show_sma, sma_period, key_prefix):
+    # Récupérer les barres hebdomadaires de tous les tickers et de la référence en une fois
+    all_data = fetch_many(tuple(tickers) + (ref_ticker,), period, "W")
+    closes = close_matrix(all_data)
+
+    # Matrice des ratios (semaines × tickers) et de leur SMA, calculée en une seule passe
+    if ref_ticker in closes:
+        ratios, ratios_sma = ratio_matrix(closes, ref_ticker, sma_period if show_sma else None)
+    else:
+        ratios, ratios_sma = pd.DataFrame(), None
+
     for ticker in tickers:
         if ticker == ref_ticker:
             continue
@@ -141,20 +176,12 @@ def display_differential_curves(tickers, ref_ticker, period, show_sma, sma_perio
 
         st.subheader(f"Différentiel entre {ticker} et {ref_ticker}")
 
-        # Récupérer les données en utilisant la fonction mise en cache
-        ref_data = fetch_data(ref_ticker, period)
-        ticker_data = fetch_data(ticker, period)
-        
-        if ref_data is None or ticker_data is None or ref_data.empty or ticker_data.empty:
+        if ticker not in ratios:
             st.warning(f"Aucune donnée trouvée pour {ticker} ou {ref_ticker}.")
             continue
 
-        # Resample des données en semaines 
-        ref_data = ref_data.resample('W').agg({'Close': 'last'})
-        ticker_data = ticker_data.resample('W').agg({'Close': 'last'})
-
-        # Calcul du différentiel
-        diff_data = ticker_data['Close'] / ref_data['Close']
+        # Différentiel du ticker : simple extraction de colonne
+        diff_data = ratios[ticker]
 
         # Création du graphique différentiel
         fig = go.Figure(data=[go.Scatter(
@@ -166,10 +193,9 @@ def display_differential_curves(tickers, ref_ticker, period, show_sma, sma_perio
 
         # Ajouter la moyenne mobile simple si activée
         if show_sma:
-            diff_data_sma = diff_data.rolling(window=sma_period).mean()
             fig.add_trace(go.Scatter(
                 x=diff_data.index,
-                y=diff_data_sma,
+                y=ratios_sma[ticker],
                 mode='lines',
                 name=f'SMA {sma_period} périodes',
                 line=dict(color='yellow', width=2)
@@ -193,6 +219,24 @@ def display_candlestick_deux(tickers, period, ref_ticker=None, show_sma=False, s
     green_square_list = ['SP5.PA', 'UST.PA', 'MGT.PA', 'WLD.PA', 'JPNH.PA', 'SGQI.PA', 'CRP.PA', 'GC=F']
     red_square_list = ['FDJ.PA', 'ENGI.PA', 'ORA.PA', 'STLAP.PA', 'CS.PA', 'EN.PA', 'DG.PA', 'TTE.PA', 'GLE.PA', 'BNP.PA', 'TFI.PA','GTT.PA','NXI.PA']
     
+    # Rendements disponibles (calculés en arrière-plan, affichés dès qu'ils sont prêts)
+    yield_service = get_yield_service()
+    yields = yield_service.yields()
+    if yield_service.error is not None:
+        st.caption(f"⚠️ Calcul des rendements en échec ({yield_service.error}), nouvel essai automatique.")
+    elif not yield_service.ready():
+        st.caption("⏳ Rendements en cours de calcul, ils s'afficheront au prochain rafraîchissement.")
+    
+    # Récupérer les barres hebdomadaires de tous les tickers (et de la référence) en une seule requête
+    all_data = fetch_many(tuple(tickers) + ((ref_ticker,) if ref_ticker else ()), period, "W")
+    
+    # Matrice des ratios par rapport à la référence, calculée une seule fois pour tout l'onglet
+    ratios, ratios_sma = pd.DataFrame(), None
+    if ref_ticker:
+        closes = close_matrix(all_data)
+        if ref_ticker in closes:
+            ratios, ratios_sma = ratio_matrix(closes, ref_ticker, sma_period if show_sma else None)
+    
     for ticker in tickers:
         # Préfixe pour chaque ticker
         unique_key = f"{key_prefix}_{ticker}"
@@ -205,24 +249,18 @@ def display_candlestick_deux(tickers, period, ref_ticker=None, show_sma=False, s
         else:
             title_prefix = ""
         
-        # Récupérer le rendement pour le ticker, si disponible
-        yield_percentage = dividendes_ratio.get(ticker, None)
-        
         # Titre principal sans rendement
         st.subheader(f"{title_prefix}Cours de {ticker} - {period} d'historique")
         
-        # Préparer le titre du rendement
-        title_rendement = f"Rendement : {yield_percentage} %" if yield_percentage is not None else ""
+        # Préparer le titre du rendement (12 mois glissants et année N-1)
+        title_rendement = titre_rendement(yields, ticker)
         
         # Récupérer les données de cours pour le ticker
-        data = fetch_data(ticker, period)
+        data = all_data.get(ticker)
         if data is None or data.empty:
             st.warning(f"Aucune donnée trouvée pour {ticker}.")
             continue
         
-        # Resample les données hebdomadaires
-        data = data.resample('W').agg({'Close': 'last', 'Open': 'first', 'High': 'max', 'Low': 'min'})
-        
         # Création du graphique
         fig = go.Figure()
         
@@ -238,10 +276,10 @@ def display_candlestick_deux(tickers, period, ref_ticker=None, show_sma=False, s
         
         # Ajouter la moyenne mobile simple si activée
         if show_sma:
-            data['SMA'] = data['Close'].rolling(window=sma_period).mean()
+            sma = data['Close'].rolling(window=sma_period).mean()
             fig.add_trace(go.Scatter(
                 x=data.index,
-                y=data['SMA'],
+                y=sma,
                 mode='lines',
                 name=f'SMA {sma_period} périodes',
                 line=dict(color='yellow', width=2)
@@ -265,14 +303,9 @@ def display_candlestick_deux(tickers, period, ref_ticker=None, show_sma=False, s
         
         # Ajouter la courbe différentielle si un ticker de référence est spécifié
         if ref_ticker and ref_ticker != ticker:
-            # Récupérer les données de l'indice de référence
-            ref_data = fetch_data(ref_ticker, period)
-            if ref_data is not None and not ref_data.empty:
-                # Resample des données en semaines
-                ref_data = ref_data.resample('W').agg({'Close': 'last'})
-                
-                # Calcul du différentiel
-                diff_data = data['Close'] / ref_data['Close']
+            if ticker in ratios:
+                # Différentiel du ticker : simple extraction de colonne
+                diff_data = ratios[ticker]
                 
                 # Ajouter la courbe différentielle sur un axe secondaire
                 fig.add_trace(go.Scatter(
@@ -285,7 +318,7 @@ def display_candlestick_deux(tickers, period, ref_ticker=None, show_sma=False, s
                 
                 # Ajouter une moyenne mobile pour le différentiel si demandé
                 if show_sma:
-                    diff_data_sma = diff_data.rolling(window=sma_period).mean()
+                    diff_data_sma = ratios_sma[ticker]
                     fig.add_trace(go.Scatter(
                         x=diff_data_sma.index,
                         y=diff_data_sma,
@@ -322,11 +355,12 @@ def display_candlestick_deux(tickers, period, ref_ticker=None, show_sma=False, s
 
 
 
-# Onglets
-tab1, tab2, tab3, tab5 , tab6 = st.tabs(["Indices", "Indices - différentiels", "Actions",  "Devises", "Recherche"])
+# Compteurs du regroupement des téléchargements (hits / misses / coalesced)
+with st.sidebar.expander("Statistiques de téléchargement"):
+    st.json(singleflight.stats())
 
 # Onglet 1 : Indices
-with tab1:
+def onglet_indices():
     st.subheader("Graphique en chandelier des ETFs")
 
     # Charger la liste des ETFs
@@ -336,45 +370,45 @@ with tab1:
         "Choisissez la profondeur historique des données :",
         ('2 ans', '5 ans'),
         index=1,
-        key="period_chandeliers_etfs"
+        key="period_chandeliers_etfs", persist_state="page"
     )
     period = "2y" if selected_period == '2 ans' else "5y"
 
     # Saisie des ETFs
-    etfs_input = st.text_input("Entrez les symboles des ETFs séparés par des virgules", ','.join(selected_etfs), key="etf_input")
+    etfs_input = st.text_input("Entrez les symboles des ETFs séparés par des virgules", ','.join(selected_etfs), key="etf_input", persist_state="page")
     etfs = [etf.strip() for etf in etfs_input.split(",")]
 
     # Sauvegarder la liste des ETFs
     if st.button("Sauvegarder la liste des ETFs"):
         save_list('etf_list.txt', etfs)
 
-    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_etfs")
+    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_etfs", persist_state="page")
     if show_sma:
-        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_etfs")
+        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_etfs", persist_state="page")
 
     display_candlestick(etfs, period, show_sma, sma_period, key_prefix="etfs")
 
 # Onglet 2 : Indices - Courbes différentielles
-with tab2:
+def onglet_indices_differentiels():
     st.subheader("Courbes différentielles entre les ETFs")
 
     # Charger la liste des ETFs
     selected_etfs = load_list('etf_list.txt')
 
     # Choix de l'ETF de référence
-    etf_ref = st.selectbox('Choisissez l\'ETF de référence pour la division', selected_etfs, index=0, key="etf_ref_diff")
+    etf_ref = st.selectbox('Choisissez l\'ETF de référence pour la division', selected_etfs, index=0, key="etf_ref_diff", persist_state="page")
 
     selected_period = st.radio(
         "Choisissez la profondeur historique des données :",
         ('2 ans', '5 ans'),
         index=1,
-        key="period_diff_etfs"
+        key="period_diff_etfs", persist_state="page"
     )
     period = "2y" if selected_period == '2 ans' else "5y"
 
-    show_sma_diff = st.checkbox('Afficher la moyenne mobile simple (SMA) pour les courbes différentielles', value=True, key="sma_diff_etfs")
+    show_sma_diff = st.checkbox('Afficher la moyenne mobile simple (SMA) pour les courbes différentielles', value=True, key="sma_diff_etfs", persist_state="page")
     if show_sma_diff:
-        sma_diff_period = st.slider('Choisissez le nombre de périodes pour la SMA des courbes différentielles', min_value=5, max_value=100, value=30, key="sma_diff_period_etfs")
+        sma_diff_period = st.slider('Choisissez le nombre de périodes pour la SMA des courbes différentielles', min_value=5, max_value=100, value=30, key="sma_diff_period_etfs", persist_state="page")
 
     display_differential_curves(selected_etfs, etf_ref, period, show_sma_diff, sma_diff_period, key_prefix="etf_diff")
 
@@ -407,7 +441,7 @@ with tab2:
 
 #     display_candlestick_deux(actions, period, show_sma, sma_period, key_prefix="actions")
 
-with tab3:
+def onglet_actions():
     st.subheader("Graphique en chandelier des Actions")
     # Charger la liste des Actions
     selected_actions = load_list('actions_list.txt')
@@ -417,12 +451,12 @@ with tab3:
         "Choisissez la profondeur historique des données :",
         ('2 ans', '5 ans'),
         index=1,
-        key="period_chandeliers_actions"
+        key="period_chandeliers_actions", persist_state="page"
     )
     period = "2y" if selected_period == '2 ans' else "5y"
     
     # Saisie des Actions
-    actions_input = st.text_input("Entrez les symboles des Actions séparés par des virgules", ','.join(selected_actions), key="actions_input")
+    actions_input = st.text_input("Entrez les symboles des Actions séparés par des virgules", ','.join(selected_actions), key="actions_input", persist_state="page")
     actions = [action.strip() for action in actions_input.split(",")]
     
     # Sauvegarder la liste des Actions
@@ -433,21 +467,21 @@ with tab3:
     ref_choice = st.radio(
         "Choisissez la référence pour la division :",
         ('^FCHI', '^STOXX50E', '^SPX', 'Entrer une action manuellement', 'Aucune référence'),
-        key="reference_choice_radio"  # Clé unique
+        key="reference_choice_radio", persist_state="page"  # Clé unique
     )
     
     # Si l'utilisateur choisit d'entrer une action manuellement, afficher une zone de texte
     action_ref = None
     if ref_choice == 'Entrer une action manuellement':
-        action_ref = st.text_input('Entrez l\'action de référence pour la division', key="action_ref_diff")
+        action_ref = st.text_input('Entrez l\'action de référence pour la division', key="action_ref_diff", persist_state="page")
     elif ref_choice != 'Aucune référence':
         # Si l'utilisateur choisit un indice prédéfini
         action_ref = ref_choice
     
     # Options pour la moyenne mobile
-    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_actions")
+    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_actions", persist_state="page")
     if show_sma:
-        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_actions")
+        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_actions", persist_state="page")
     else:
         sma_period = 20  # Valeur par défaut même si non affiché
     
@@ -498,7 +532,7 @@ with tab3:
 #     display_differential_curves(selected_actions, action_ref, period, show_sma_diff, sma_diff_period, key_prefix="action_diff")
 
 # Onglet 5 : Devises
-with tab5:
+def onglet_devises():
     st.subheader("Graphique en chandelier des Devises")
 
     # Charger la liste des Devises
@@ -508,27 +542,27 @@ with tab5:
         "Choisissez la profondeur historique des données :",
         ('2 ans', '5 ans'),
         index=1,
-        key="period_chandeliers_devises"
+        key="period_chandeliers_devises", persist_state="page"
     )
     period = "2y" if selected_period == '2 ans' else "5y"
 
     # Saisie des Devises
-    devises_input = st.text_input("Entrez les symboles des Devises séparés par des virgules", ','.join(selected_devises), key="devises_input")
+    devises_input = st.text_input("Entrez les symboles des Devises séparés par des virgules", ','.join(selected_devises), key="devises_input", persist_state="page")
     devises = [devise.strip() for devise in devises_input.split(",")]
 
     # Sauvegarder la liste des Devises
     if st.button("Sauvegarder la liste des Devises"):
         save_list('devises_list.txt', devises)
 
-    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_devises")
+    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_devises", persist_state="page")
     if show_sma:
-        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_devises")
+        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_devises", persist_state="page")
 
     display_candlestick(devises, period, show_sma, sma_period, key_prefix="devises")
 
 # Onglet 6 : Recherche
 
-with tab6:
+def onglet_recherche():
     st.subheader("Graphique en chandelier pour Recherche")
     
     # Charger la liste des symboles
@@ -539,12 +573,12 @@ with tab6:
         "Choisissez la profondeur historique des données :",
         ('2 ans', '5 ans'),
         index=1,
-        key="period_chandeliers_recherche"
+        key="period_chandeliers_recherche", persist_state="page"
     )
     period = "2y" if selected_period == '2 ans' else "5y"
     
     # Saisie des symboles
-    recherche_input = st.text_input("Entrez les symboles séparés par des virgules", ','.join(selected_recherche), key="recherche_input")
+    recherche_input = st.text_input("Entrez les symboles séparés par des virgules", ','.join(selected_recherche), key="recherche_input", persist_state="page")
     recherche = [symb.strip() for symb in recherche_input.split(",")]
     
     # Sauvegarder la liste des symboles
@@ -555,21 +589,21 @@ with tab6:
     ref_choice = st.radio(
         "Choisissez la référence pour la division :",
         ('^SPX','^STOXX50E','^FCHI',   'Entrer une action manuellement', 'Aucune référence'),
-        key="reference_choice_recherche"  # Clé unique
+        key="reference_choice_recherche", persist_state="page"  # Clé unique
     )
     
     # Si l'utilisateur choisit d'entrer une action manuellement, afficher une zone de texte
     action_ref = None
     if ref_choice == 'Entrer une action manuellement':
-        action_ref = st.text_input('Entrez l\'action de référence pour la division', key="action_ref_diff_recherche")
+        action_ref = st.text_input('Entrez l\'action de référence pour la division', key="action_ref_diff_recherche", persist_state="page")
     elif ref_choice != 'Aucune référence':
         # Si l'utilisateur choisit un indice prédéfini
         action_ref = ref_choice
     
     # Options pour la moyenne mobile
-    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_recherche")
+    show_sma = st.checkbox('Afficher la moyenne mobile simple (SMA)', value=True, key="sma_recherche", persist_state="page")
     if show_sma:
-        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_recherche")
+        sma_period = st.slider('Choisissez le nombre de périodes pour la SMA', min_value=5, max_value=100, value=30, key="sma_period_recherche", persist_state="page")
     else:
         sma_period = 20  # Valeur par défaut même si non affiché
     
@@ -617,3 +651,21 @@ with tab6:
 #         sma_diff_period = st.slider('Choisissez le nombre de périodes pour la SMA des courbes différentielles', min_value=5, max_value=100, value=30, key="sma_diff_period_recherche")
 
 #     display_differential_curves(selected_recherche, recherche_ref, period, show_sma_diff, sma_diff_period, key_prefix="recherche_diff")
+
+
+# Onglets : seul l'onglet sélectionné récupère ses données et construit ses
+# graphiques (`on_change="rerun"` + `tab.open`), les autres restent en sommeil.
+# Les widgets des onglets utilisent persist_state="page" pour garder leur
+# valeur pendant qu'ils ne sont pas affichés.
+onglets = {
+    "Indices": onglet_indices,
+    "Indices - différentiels": onglet_indices_differentiels,
+    "Actions": onglet_actions,
+    "Devises": onglet_devises,
+    "Recherche": onglet_recherche,
+}
+
+for tab, afficher_onglet in zip(st.tabs(list(onglets), key="onglet_actif", on_change="rerun"), onglets.values()):
+    with tab:
+        if tab.open:
+            afficher_onglet()
@@ -0,0 +1,194 @@
+"""
+sweep.py — Balayage parallèle des paramètres du backtest momentum.
+
+Chaque combinaison (lookback, skip, n_stocks, rebal_freq, weighting,
+cost_bps) d'une grille est évaluée dans un pool de processus. La matrice de
+prix n'est pas envoyée aux processus : elle est publiée une fois dans le
+cache partagé (fichier Arrow projeté en mémoire, voir shared_cache) et chaque
+processus la relit sans copie, en lecture seule.
+
+walk_forward enchaîne des fenêtres apprentissage / test (glissantes ou
+croissantes) : sur chaque fenêtre d'apprentissage on retient la meilleure
+combinaison, appliquée ensuite à la fenêtre de test qui suit.
+
+Réglage par variable d'environnement :
+    INDEX_SUIVI_SWEEP_WORKERS  (défaut : nombre de cœurs)
+"""
+
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import shared_cache
+from backtest import performance, run_backtest
+from price_matrix import PriceMatrix
+
+MAX_WORKERS = int(os.environ.get("INDEX_SUIVI_SWEEP_WORKERS", str(os.cpu_count() or 1)))
+PARAMETERS = ["lookback", "skip", "n_stocks", "rebal_freq", "weighting", "cost_bps"]
+METRICS = ["CAGR", "Volatilité", "Sharpe", "Max Drawdown", "Calmar", "Perf totale"]
+
+# État des processus du pool (fixé par _init)
+_prices = None
+_start = None
+_universe = None
+
+
+def combinations(grid):
+    """Produit cartésien d'une grille {paramètre: [valeurs]} : liste de dicts."""
+    names = [p for p in PARAMETERS if p in grid]
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[p] for p in names))]
+
+
+def _init(key, start, universe=None):
+    global _prices, _start, _universe
+    _prices = shared_cache.get(key)
+    if _prices is None:
+        raise RuntimeError("Matrice de prix absente du cache partagé")
+    _start = start
+    _universe = universe
+
+
+def _returns(params):
+    """Rendements quotidiens d'une combinaison depuis `_start` (Series vide si inexploitable)."""
+    rets, _, _ = run_backtest(_prices, **params, universe=_universe)
+    if rets is None:
+        return pd.Series(dtype="float64")
+    return rets.loc[str(_start):] if _start is not None else rets
+
+
+def _evaluate(params):
+    """Backtest d'une combinaison : métriques numériques (NaN si inexploitable)."""
+    rets, _, turnover = run_backtest(_prices, **params, universe=_universe)
+    if rets is not None and _start is not None:
+        rets = rets.loc[str(_start):]
+    if rets is None or rets.empty:
+        return dict.fromkeys(METRICS + ["Turnover"], np.nan)
+    stats, _, _ = performance(rets)
+    stats["Turnover"] = turnover
+    return stats
+
+
+def _map(fn, prices, combos, start, universe, max_workers, progress):
+    """Applique `fn` (fonction du module) à chaque combinaison, dans l'ordre."""
+    if isinstance(prices, PriceMatrix):
+        prices = prices.to_frame()
+    key = ("sweep", shared_cache.fingerprint(prices))
+    shared_cache.get_or_compute(key, lambda: prices)
+
+    results = []
+    workers = min(max_workers, len(combos))
+    if workers <= 1:
+        _init(key, start, universe)
+        for params in combos:
+            results.append(fn(params))
+            if progress:
+                progress(len(results), len(combos))
+        return results
+
+    # spawn : pas de fork d'un serveur multi-thread (Streamlit)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init, initargs=(key, start, universe)) as executor:
+        for result in executor.map(fn, combos):
+            results.append(result)
+            if progress:
+                progress(len(results), len(combos))
+    return results
+
+
+def run_sweep(prices, grid, start=None, universe=None, max_workers=MAX_WORKERS,
+              progress=None):
+    """Évalue toutes les combinaisons de `grid` sur `prices`.
+
+    `prices` : DataFrame ou PriceMatrix (dates × tickers).
+    `start`  : les métriques sont calculées à partir de cette date.
+    `universe` : composition historique de l'indice (voir backtest.run_backtest).
+    `progress(fait, total)` est appelé après chaque combinaison.
+    Retourne un DataFrame : une ligne par combinaison, paramètres puis métriques.
+    """
+    combos = combinations(grid)
+    results = _map(_evaluate, prices, combos, start, universe, max_workers, progress)
+    table = pd.DataFrame(combos)
+    return pd.concat([table, pd.DataFrame(results, index=table.index)], axis=1)
+
+
+def heatmap_table(results, metric, x, y):
+    """Tableau y × x de `metric`, moyenné sur les autres paramètres balayés."""
+    return results.pivot_table(index=y, columns=x, values=metric, aggfunc="mean")
+
+
+def _scores(rets, freq=252):
+    """Métriques de chaque colonne d'une fenêtre de rendements (version vectorisée
+    de backtest.performance) : DataFrame métriques × colonnes."""
+    cum = (1 + rets).cumprod()
+    cagr = cum.iloc[-1] ** (freq / len(rets)) - 1
+    vol = rets.std() * np.sqrt(freq)
+    sharpe = (rets.mean() * freq / vol).where(vol > 0)
+    max_dd = (cum / cum.cummax() - 1).min()
+    calmar = (cagr / max_dd.abs()).where(max_dd < 0)
+    return pd.DataFrame({"CAGR": cagr, "Volatilité": vol, "Sharpe": sharpe,
+                         "Max Drawdown": max_dd, "Calmar": calmar}).T
+
+
+def windows(start, end, train_months, test_months, expanding=False):
+    """Fenêtres (début apprentissage, début test, fin test), fin de test exclue."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    out = []
+    test_start = start + pd.DateOffset(months=train_months)
+    while test_start < end:
+        train_start = start if expanding else test_start - pd.DateOffset(months=train_months)
+        out.append((train_start, test_start, min(test_start + pd.DateOffset(months=test_months), end)))
+        test_start += pd.DateOffset(months=test_months)
+    return out
+
+
+def walk_forward(prices, grid, start, train_months=36, test_months=12, expanding=False,
+                 metric="Sharpe", universe=None, max_workers=MAX_WORKERS, progress=None):
+    """Évaluation walk-forward de la grille `grid` à partir de `start`.
+
+    Le backtest est causal (le rendement d'un jour ne dépend que des prix
+    passés) : chaque combinaison est simulée une seule fois sur tout
+    l'historique, en parallèle, et chaque fenêtre se réduit à un découpage de
+    ces rendements. Le changement de combinaison entre deux fenêtres de test
+    n'est pas facturé en coûts de transaction.
+
+    Retourne (rendements hors échantillon enchaînés, tableau des fenêtres),
+    ou (None, tableau vide) si aucune fenêtre n'est exploitable.
+    """
+    combos = combinations(grid)
+    series = _map(_returns, prices, combos, start, universe, max_workers, progress)
+    rets = pd.concat(series, axis=1, keys=range(len(combos))).sort_index()
+    if rets.empty:
+        return None, pd.DataFrame()
+    # Une combinaison n'est retenue que si elle couvre toute la fenêtre
+    # d'apprentissage ; un rebalancement sauté laisse le portefeuille en liquidités.
+    first = pd.Series({i: s.index[0] for i, s in enumerate(series) if len(s)}, dtype="datetime64[ns]")
+    rets = rets.fillna(0.0)
+
+    rows, chained = [], []
+    end = rets.index[-1] + pd.Timedelta(days=1)
+    for train_start, test_start, test_end in windows(start, end, train_months,
+                                                     test_months, expanding):
+        train = rets[(rets.index >= train_start) & (rets.index < test_start)]
+        test = rets[(rets.index >= test_start) & (rets.index < test_end)]
+        if len(train) < 2 or test.empty:
+            continue
+        train = train[first.index[first <= train.index[0]]]
+        score = _scores(train).loc[metric]
+        if score.isna().all():
+            continue
+        best = score.idxmax()
+        oos = _scores(test[[best]])[best]
+        chained.append(test[best])
+        rows.append({"Apprentissage": f"{train_start.date()} → {test_start.date()}",
+                     "Test": f"{test_start.date()} → {test_end.date()}",
+                     **combos[best], f"{metric} (appr.)": score[best],
+                     "CAGR (test)": oos["CAGR"], "Sharpe (test)": oos["Sharpe"],
+                     "Max Drawdown (test)": oos["Max Drawdown"]})
+    if not chained:
+        return None, pd.DataFrame()
+    return pd.concat(chained), pd.DataFrame(rows)
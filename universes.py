@@ -0,0 +1,178 @@
+"""
+universes.py — Univers d'investissement des pages momentum.
+
+Un Universe regroupe tout ce qui distingue une page momentum d'une autre :
+la récupération de la composition de l'indice, l'indice de référence et les
+libellés. Le moteur commun (momentum_page.render) fait le reste ; ajouter un
+univers revient à déclarer une nouvelle entrée de UNIVERSES.
+
+La composition est servie depuis un instantané local (voir constituents) :
+- instantané de moins de SNAPSHOT_TTL secondes : aucune requête ;
+- instantané plus ancien : servi tel quel, et revalidé en arrière-plan par
+  une requête conditionnelle (If-None-Match / If-Modified-Since) ;
+- aucun instantané : requête synchrone (délai REQUEST_TIMEOUT).
+En cas d'échec (réseau, page modifiée), le dernier instantané valide reste
+en service : le lancement d'un backtest n'attend jamais la page HTML.
+
+Réglage par variable d'environnement :
+    INDEX_SUIVI_CONSTITUENTS_TTL  (défaut : 86400 secondes)
+"""
+
+import os
+import threading
+import time
+from io import StringIO
+
+import pandas as pd
+import requests
+
+import constituents
+
+SNAPSHOT_TTL = int(os.environ.get("INDEX_SUIVI_CONSTITUENTS_TTL", "86400"))
+REQUEST_TIMEOUT = 10
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36"
+}
+
+
+class Universe:
+    """Définition d'un univers.
+
+    `key`         : identifiant (stockage de la composition, clés de session) ;
+    `url`         : page publiant la composition ;
+    `parse(html)` : retourne (tickers, {ticker: secteur}, changements ou None),
+                    les changements au format de constituents.record ;
+    `benchmark`   : ticker Yahoo Finance de l'indice de référence (buy & hold).
+    """
+
+    def __init__(self, key, name, benchmark, url, parse, start, caption):
+        self.key = key
+        self.name = name
+        self.benchmark = benchmark
+        self.url = url
+        self.parse = parse
+        self.start = start
+        self.caption = caption
+
+
+def _sp500(html):
+    """Composition du S&P 500 et historique des entrées / sorties (Wikipedia)."""
+    tables = pd.read_html(StringIO(html))
+    table = tables[0]
+    tickers = table["Symbol"].str.replace(".", "-", regex=False).tolist()
+    sectors = dict(zip(tickers, table["GICS Sector"]))
+
+    # Second tableau : historique des entrées / sorties de l'indice
+    try:
+        history = tables[1]
+        changes = pd.DataFrame({
+            "Date": history.iloc[:, 0],
+            "Added": history[("Added", "Ticker")].str.replace(".", "-", regex=False),
+            "Removed": history[("Removed", "Ticker")].str.replace(".", "-", regex=False),
+        })
+    except (IndexError, KeyError):
+        changes = None
+    return tickers, sectors, changes
+
+
+def _eurostoxx50(html):
+    """Composition de l'EURO STOXX 50 (Wikipedia, sans historique des changements)."""
+    tables = pd.read_html(StringIO(html))
+
+    # Trouver le tableau qui contient la colonne "Ticker"
+    table = next((t for t in tables if "Ticker" in t.columns), None)
+    if table is None:
+        raise ValueError("Impossible de trouver le tableau des constituants.")
+
+    # Les tickers sont déjà au format Yahoo Finance (ex: ADS.DE, ADYEN.AS)
+    tickers = table["Ticker"].tolist()
+    return tickers, dict(zip(table["Ticker"], table["Sector"])), None
+
+
+SP500 = Universe(
+    "sp500", "S&P 500", "SPY", "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies",
+    _sp500, "2015-01-01",
+    "⚠️ Univers = composition **historique** du S&P 500 (entrées / sorties listées sur "
+    "Wikipédia) ; les titres radiés absents de Yahoo Finance manquent → biais du survivant résiduel. "
+    "Résultats à interpréter avec prudence. Usage éducatif uniquement.")
+
+EUROSTOXX50 = Universe(
+    "eurostoxx50", "EURO STOXX 50", "SXRT.DE", "https://en.wikipedia.org/wiki/EURO_STOXX_50",
+    _eurostoxx50, "2025-01-01",
+    "⚠️ Univers = composition **actuelle** de EURO STOXX 50, sauf si une liste d'entrées / "
+    "sorties a été enregistrée (voir constituents.py) → biais du survivant. "
+    "Résultats à interpréter avec prudence. Usage éducatif uniquement.")
+
+UNIVERSES = {u.key: u for u in (SP500, EUROSTOXX50)}
+
+
+# ---------------------------------------------------------------
+# Instantanés de composition
+# ---------------------------------------------------------------
+_refreshing = {}
+_refreshing_lock = threading.Lock()
+
+
+def _revalidate(universe, meta):
+    """Requête conditionnelle sur la page de `universe` ; enregistre le résultat.
+
+    304 : l'instantané est conservé tel quel (seule la date de vérification
+    change). 200 : la page est analysée puis enregistrée avec ses validateurs.
+    """
+    headers = dict(_HEADERS)
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    response = requests.get(universe.url, headers=headers, timeout=REQUEST_TIMEOUT)
+    checked = time.time()
+    if response.status_code == 304 and meta.get("sectors") is not None:
+        constituents.record(universe.key, meta["current"], sectors=meta["sectors"],
+                            etag=meta.get("etag"), last_modified=meta.get("last_modified"),
+                            checked=checked)
+        return
+    response.raise_for_status()  # lève une erreur si problème
+    tickers, sectors, changes = universe.parse(response.text)
+    if not tickers:
+        raise ValueError(f"Aucun constituant trouvé sur {universe.url}")
+    constituents.record(universe.key, tickers, changes, sectors=sectors,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                        checked=checked)
+
+
+def _refresh(universe, meta):
+    try:
+        _revalidate(universe, meta)
+    except Exception as e:
+        print(f"Erreur lors de la mise à jour de la composition {universe.name} : {e}")
+
+
+def snapshot(universe):
+    """Composition de `universe` : (tickers, {ticker: secteur}).
+
+    Sert l'instantané local ; s'il a plus de SNAPSHOT_TTL secondes, une
+    revalidation est lancée en arrière-plan (au plus une par univers).
+    Sans instantané, la page est lue immédiatement (exception si elle échoue ;
+    une composition enregistrée sans secteurs sert alors de secours).
+    """
+    meta = constituents.snapshot(universe.key)
+    if meta.get("sectors") is None:
+        try:
+            _revalidate(universe, meta)
+        except Exception:
+            if not meta.get("current"):
+                raise
+            return meta["current"], {}
+        meta = constituents.snapshot(universe.key)
+    elif time.time() - meta.get("checked", 0) > SNAPSHOT_TTL:
+        with _refreshing_lock:
+            thread = _refreshing.get(universe.key)
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=_refresh, args=(universe, meta), daemon=True)
+                _refreshing[universe.key] = thread
+                thread.start()
+    return meta["current"], meta["sectors"]